@@ -4,10 +4,16 @@
 Módulo para a cog dos comandos de administrador.
 '''
 
+from __future__ import annotations
+from typing import Iterator
+
+import asyncio
+
 from discord.ext import commands
 
 from discpybotframe.cogs.cog import Cog
-from discpybotframe.utils.utilities import DiscordUtilities
+from discpybotframe.utils.dispatcher import MessagePriority
+from discpybotframe.utils.utilities import DiscordUtilities, EmbedTemplate
 from discpybotframe.validation.admin_cog_validator import AdminCogValidator
 
 
@@ -19,10 +25,12 @@ class AdminCog(Cog):
 
     # Atributos privados
     _goodbye_message: str
+    _goodbye_template: EmbedTemplate
 
     def __init__(self, bot, goodbye_message: str) -> None:
         super().__init__(bot)
         self._goodbye_message = goodbye_message
+        self._goodbye_template = EmbedTemplate('Encerrando', goodbye_message, 'shutdown')
         self.bot.log('AdminCog', 'Administrator command system initialized')
 
     # Comandos
@@ -32,7 +40,7 @@ class AdminCog(Cog):
         Desliga o bot.
         '''
 
-        self.bot.log('AdminCog', f'<off> (Author: {ctx.author.name})')
+        self.bot.log('AdminCog', '<off> (Author: %s)', ctx.author.name)
 
         if not await AdminCogValidator.shutdown_validation(ctx,
                                                            self.bot,
@@ -41,11 +49,15 @@ class AdminCog(Cog):
             return
 
         # Envia uma mensagem de saída
-        await DiscordUtilities.send_message(ctx, 'Encerrando', self._goodbye_message, 'shutdown')
+        await DiscordUtilities.send_template(ctx, self._goodbye_template, priority=MessagePriority.HIGH)
 
-        # Encerra o bot
+        # Encerra o bot ou, se ele roda em um cluster, todos os processos
         self.bot.log('AdminCog', 'Exiting')
-        await self.bot.close()
+
+        if self.bot.cluster is not None:
+            self.bot.cluster.notify('off')
+        else:
+            await self.bot.close()
 
     @commands.command(name='info')
     async def info(self, ctx) -> None:
@@ -53,13 +65,32 @@ class AdminCog(Cog):
         Exibe informações.
         '''
 
-        self.bot.log('AdminCog', f'<info> (Author: {ctx.author.name})')
+        self.bot.log('AdminCog', '<info> (Author: %s)', ctx.author.name)
+
+        lines: Iterator[str] | None = None
+
+        if self.bot.cluster is not None:
+            try:
+                lines = self._cluster_info_lines(await self.bot.cluster.request('info'))
+            except asyncio.TimeoutError:
+                self.bot.log('AdminCog', 'Cluster info request timed out')
 
-        bot_info = self.bot.get_info()
+        if lines is None:
+            lines = (f'⬩ **{key}**: {value}' for key, value in self.bot.get_info().items())
+
+        await DiscordUtilities.send_paginated(ctx, 'Informações', lines, 'info', priority=MessagePriority.HIGH)
+
+    @staticmethod
+    def _cluster_info_lines(infos: dict[int, dict | None]) -> Iterator[str]:
+        '''
+        Gera as linhas de informações de todos os processos do cluster.
+        '''
 
-        description = ''
+        for worker_id, bot_info in infos.items():
+            yield f'**Processo {worker_id}**'
 
-        for key in bot_info:
-            description += f'⬩ **{key}**: {bot_info[key]}\n'
+            if bot_info is None:
+                yield '⬩ Sem resposta'
+                continue
 
-        await DiscordUtilities.send_message(ctx, 'Informações', description, 'info')
+            yield from (f'⬩ **{key}**: {value}' for key, value in bot_info.items())
@@ -19,6 +19,7 @@ class Cog(commands.Cog):
     Definição base de cog.
     '''
 
+    # Sem __slots__: as instâncias de commands.Cog sempre têm um __dict__
     _bot: Bot
 
     def __init__(self, bot: Bot) -> None:
@@ -4,9 +4,12 @@
 Módulo para a cog dos comandos de ajuda
 '''
 
+from __future__ import annotations
+
 from discord.ext import commands
 
-from discpybotframe.utils.utilities import DiscordUtilities
+from discpybotframe.internals.throttle import ThrottleScope, throttle
+from discpybotframe.utils.utilities import DiscordUtilities, EmbedTemplate
 from discpybotframe.cogs.cog import Cog
 
 
@@ -17,19 +20,32 @@ class HelpCog(Cog):
     '''
 
     _help_text: str
+    _help_template: EmbedTemplate | None
 
     # Construtor
     def __init__(self, bot, help_text) -> None:
         super().__init__(bot)
         self._help_text = help_text
+        self._help_template = EmbedTemplate("Ajuda", help_text, "help")
+
+        # Textos longos são paginados a cada envio
+        if len(self._help_template) > DiscordUtilities.EMBED_LIMIT:
+            self._help_template = None
+
         self.bot.log("HelpCog", "Help system initialized")
 
     # Comandos
+    @throttle(3, 10.0, ThrottleScope.USER)
+    @throttle(20, 10.0, ThrottleScope.GUILD)
     @commands.command(name="help", aliases=("ajuda", "h", "aj"))
     async def custom_help(self, ctx) -> None:
         '''
         Envia uma mensagem de ajuda.
         '''
 
-        self.bot.log("HelpCog", f"<help> (Author: {ctx.author.name})")
-        await DiscordUtilities.send_message(ctx, "Ajuda", self._help_text, "help")
+        self.bot.log("HelpCog", "<help> (Author: %s)", ctx.author.name)
+
+        if self._help_template is not None:
+            await DiscordUtilities.send_template(ctx, self._help_template)
+        else:
+            await DiscordUtilities.send_message(ctx, "Ajuda", self._help_text, "help")
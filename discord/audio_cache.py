@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para o cache de áudios pré-codificados.
+'''
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+
+from collections import OrderedDict
+
+import discord
+
+from discord.oggparse import OggStream
+
+
+_logger = logging.LoggerAdapter(logging.getLogger('discpybotframe.AudioCache'), {'origin': 'AudioCache'})
+
+
+class CachedOpusAudio(discord.AudioSource):
+
+    '''
+    Fonte de áudio que reproduz pacotes Opus já codificados, sem processo externo.
+    '''
+
+    _packets: tuple[bytes, ...]
+    _index: int
+
+    def __init__(self, packets: tuple[bytes, ...]) -> None:
+        self._packets = packets
+        self._index = 0
+
+    def read(self) -> bytes:
+        if self._index >= len(self._packets):
+            return b''
+
+        packet = self._packets[self._index]
+        self._index += 1
+
+        return packet
+
+    def is_opus(self) -> bool:
+        return True
+
+
+class AudioCache():
+
+    '''
+    Cache de áudios pré-codificados.
+
+    Cada fonte é transcodificada uma única vez pelo ffmpeg para pacotes Opus de 20 ms, mantidos em
+    memória. As reproduções seguintes enviam os pacotes diretamente, sem iniciar o ffmpeg e sem
+    decodificar ou codificar o áudio novamente. As entradas são descartadas em ordem LRU quando o
+    total de bytes ultrapassa max_bytes.
+
+    A primeira reprodução é transmitida pelo ffmpeg enquanto a transcodificação ocorre em segundo
+    plano, de forma que ela não espera o arquivo inteiro. Fontes maiores que max_bytes são
+    marcadas e sempre transmitidas, sem novas transcodificações.
+    '''
+
+    _entries: OrderedDict[str, tuple[bytes, ...]]
+    _sizes: dict[str, int]
+    _pending: dict[str, asyncio.Future]
+    _uncacheable: set[str]
+    _max_bytes: int
+    _size: int
+    _executable: str
+    _bitrate: int
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, executable: str = 'ffmpeg', bitrate: int = 128) -> None:
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._pending = {}
+        self._uncacheable = set()
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._executable = executable
+        self._bitrate = bitrate
+
+    def __contains__(self, source: object) -> bool:
+        return source in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        '''
+        Getter do total de bytes em cache.
+        '''
+
+        return self._size
+
+    @property
+    def max_bytes(self) -> int:
+        '''
+        Getter do limite de bytes.
+        '''
+
+        return self._max_bytes
+
+    async def get_audio_source(self, source: str) -> discord.AudioSource:
+        '''
+        Retorna uma fonte de áudio reproduzível para o arquivo. Fontes fora do cache são
+        transmitidas pelo ffmpeg e, se couberem, transcodificadas para o cache em segundo plano.
+        '''
+
+        packets = self._entries.get(source)
+
+        if packets is not None:
+            self._entries.move_to_end(source)
+            return CachedOpusAudio(packets)
+
+        if source not in self._uncacheable and source not in self._pending:
+            future = self._pending[source] = asyncio.ensure_future(self._load(source))
+            future.add_done_callback(self._on_load_done)
+
+        return discord.FFmpegOpusAudio(source, bitrate=self._bitrate, executable=self._executable)
+
+    async def get_packets(self, source: str) -> tuple[bytes, ...]:
+        '''
+        Retorna os pacotes Opus de um arquivo. Transcodificações simultâneas da mesma fonte são
+        compartilhadas.
+        '''
+
+        packets = self._entries.get(source)
+
+        if packets is not None:
+            self._entries.move_to_end(source)
+            return packets
+
+        future = self._pending.get(source)
+
+        if future is None:
+            future = self._pending[source] = asyncio.ensure_future(self._load(source))
+
+        return await asyncio.shield(future)
+
+    def invalidate(self, source: str) -> None:
+        '''
+        Remove uma fonte do cache.
+        '''
+
+        self._uncacheable.discard(source)
+
+        if source in self._entries:
+            del self._entries[source]
+            self._size -= self._sizes.pop(source)
+
+    def clear(self) -> None:
+        '''
+        Esvazia o cache.
+        '''
+
+        self._entries.clear()
+        self._sizes.clear()
+        self._uncacheable.clear()
+        self._size = 0
+
+    def _store(self, source: str, packets: tuple[bytes, ...]) -> None:
+        '''
+        Guarda os pacotes, descartando as entradas menos usadas até que caibam no limite.
+        '''
+
+        size = sum(len(packet) for packet in packets)
+
+        if size > self._max_bytes:
+            self._uncacheable.add(source)
+            return
+
+        self.invalidate(source)
+
+        while self._entries and self._size + size > self._max_bytes:
+            self.invalidate(next(iter(self._entries)))
+
+        self._entries[source] = packets
+        self._sizes[source] = size
+        self._size += size
+
+    async def _load(self, source: str) -> tuple[bytes, ...]:
+        '''
+        Transcodifica uma fonte e a guarda no cache.
+        '''
+
+        try:
+            packets = await self._transcode(source)
+        finally:
+            del self._pending[source]
+
+        self._store(source, packets)
+
+        return packets
+
+    @staticmethod
+    def _on_load_done(future: asyncio.Future) -> None:
+        '''
+        Registra o erro de uma transcodificação em segundo plano.
+        '''
+
+        if not future.cancelled() and future.exception() is not None:
+            _logger.error('Background transcode failed: %s', future.exception())
+
+    async def _transcode(self, source: str) -> tuple[bytes, ...]:
+        '''
+        Transcodifica um arquivo para Ogg Opus e separa os pacotes.
+        '''
+
+        process = await asyncio.create_subprocess_exec(self._executable,
+                                                       '-nostdin',
+                                                       '-i', source,
+                                                       '-map_metadata', '-1',
+                                                       '-f', 'opus',
+                                                       '-c:a', 'libopus',
+                                                       '-ar', '48000',
+                                                       '-ac', '2',
+                                                       '-b:a', f'{self._bitrate}k',
+                                                       '-loglevel', 'error',
+                                                       'pipe:1',
+                                                       stdout=asyncio.subprocess.PIPE,
+                                                       stderr=asyncio.subprocess.PIPE)
+
+        stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            raise RuntimeError(f'ffmpeg failed to transcode "{source}": {stderr.decode(errors="replace").strip()}')
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(None, _split_packets, stdout)
+
+
+def _split_packets(data: bytes) -> tuple[bytes, ...]:
+    '''
+    Separa os pacotes de áudio de um fluxo Ogg Opus, ignorando os cabeçalhos.
+    '''
+
+    return tuple(packet for packet in OggStream(io.BytesIO(data)).iter_packets()
+                 if not packet.startswith((b'OpusHead', b'OpusTags')))
@@ -5,45 +5,75 @@ Módulo Bot System.
 '''
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
 
-import platform
+import asyncio
+import logging
 import json
 
 from abc import abstractmethod
 from os.path import exists
-from time import time_ns
+from time import perf_counter, time_ns
 from random import choice, seed
-from datetime import datetime
 
 import discord
 
 from discord.ext import commands, tasks
 from discord.ext.commands import HelpCommand
 
-from discpybotframe.internals.database import DatabaseController
+from discpybotframe.internals.cluster import ClusterClient
+from discpybotframe.internals.database import DatabaseController, StatementRegistry
+from discpybotframe.internals.guild_registry import ShardedGuildRegistry
+from discpybotframe.internals.info import InfoCollector
+from discpybotframe.internals.logger import LogPipeline
+from discpybotframe.internals.memory import resolve_memory_options
+from discpybotframe.internals.metrics import MetricsCollector, RateLimitCounter
+from discpybotframe.internals.migrations import MigrationEngine
+from discpybotframe.internals.permissions import PermissionResolver
+from discpybotframe.internals.throttle import Throttler
+from discpybotframe.internals.watchdog import LoopWatchdog
+from discpybotframe.discord.guild import Guild
+from discpybotframe.utils.dispatcher import MessageDispatcher
 
-if TYPE_CHECKING:
-    from discpybotframe.discord.guild import Guild
 
-
-class Bot(commands.Bot):
+class Bot(commands.AutoShardedBot):
 
     '''
     Bot customizado.
+
+    O bot é dividido automaticamente em shards. Os servidores personalizados são particionados por
+    shard e carregados à medida que cada shard fica pronto.
     '''
 
     # Atributos privados
     _name: str
     _version: str
     _token: str
-    _admins_id: list
+    _admins_id: set[int]
+    _permissions: PermissionResolver
+    _throttler: Throttler
     _users: dict
-    _custom_guilds: dict
+    _custom_guilds: ShardedGuildRegistry
+    _shard_bootstraps: dict[int, asyncio.Future]
+    _migration_lock: asyncio.Lock
+    _migrated: bool
     _activities: list[str]
     _custom_ready: bool
     _database_controller: DatabaseController | None
-    _init_time: datetime
+    _database_settings: dict
+    _migrations: MigrationEngine
+    _info: InfoCollector
+    _info_settings: dict
+    _watchdog: LoopWatchdog
+    _watchdog_settings: dict
+    _cluster: ClusterClient | None
+    _log_pipeline: LogPipeline
+    _metrics: MetricsCollector
+    _metrics_settings: dict
+    _dispatcher: MessageDispatcher
+    _dispatcher_settings: dict
+    _memory_settings: dict
+    _throttle_settings: dict
+    _cache_report: dict
 
     def __init__(self,
                  command_prefix: str,
@@ -53,41 +83,143 @@ class Bot(commands.Bot):
                  intents,
                  version: str,
                  database_path: str = '',
-                 dev_env: bool = False) -> None:
+                 dev_env: bool = False,
+                 guild_cache_size: int = 0,
+                 guild_idle_timeout: float = 0.0,
+                 shard_count: int | None = None,
+                 shard_ids: list[int] | None = None) -> None:
 
-        super().__init__(command_prefix=command_prefix, help_command=help_command, intents=intents)
+        # As configurações são lidas antes da inicialização do discord.py, que recebe o perfil de memória
+        self._log_pipeline = LogPipeline()
+        self._log_pipeline.start()
 
         self._name = name
         self._version = version
-        self._custom_guilds = {}
+        self._custom_guilds = ShardedGuildRegistry(self._materialize_guild,
+                                                   lambda: self.shard_count or 1,
+                                                   guild_cache_size,
+                                                   guild_idle_timeout)
+        self._shard_bootstraps = {}
+        self._migration_lock = asyncio.Lock()
+        self._migrated = False
         self._users = {}
-        self._admins_id = []
+        self._admins_id = set()
         self._token = ''
         self._activities = ['Error']
         self._custom_ready = False
         self._database_controller = None
-        self._init_time = datetime.now()
-
-        if database_path != '':
-            self._database_controller = DatabaseController(database_path)
+        self._database_settings = {}
+        self._migrations = MigrationEngine()
+        self._metrics_settings = {}
+        self._dispatcher_settings = {}
+        self._info_settings = {}
+        self._watchdog_settings = {}
+        self._cluster = None
+        self._memory_settings = {}
+        self._throttle_settings = {}
+        self._cache_report = {}
 
         environment = 'development' if dev_env else 'production'
 
-        self.log('Bot', f'Initializing {self._name} {self._version} with {environment} profile')
+        self.log('Bot', 'Initializing %s %s with %s profile', self._name, self._version, environment)
         self.log('Bot', 'Initializing the RNG')
 
         seed(time_ns())
         self.set_internal_settings(settings_file, dev_env)
 
+        memory_profile = self._memory_settings.get('profile', 'default')
+        memory_options = resolve_memory_options(intents,
+                                                memory_profile,
+                                                {key: value for key, value in self._memory_settings.items() if key != 'profile'})
+
+        super().__init__(command_prefix=command_prefix,
+                         help_command=help_command,
+                         shard_count=shard_count,
+                         shard_ids=shard_ids,
+                         **memory_options)
+
+        self.log('Bot', 'Caches configured with the "%s" memory profile', memory_profile)
+
+        self._metrics = MetricsCollector(self._metrics_settings.get('window', 1024))
+        logging.getLogger('discord.http').addHandler(RateLimitCounter(self._metrics))
+
+        self._dispatcher = MessageDispatcher(self._dispatcher_settings.get('rate', 1.0),
+                                             self._dispatcher_settings.get('burst', 5),
+                                             self._dispatcher_settings.get('coalesce', True))
+
+        self._info = InfoCollector(self._name,
+                                   self._version,
+                                   lambda: self.latency,
+                                   self._info_settings.get('ttl', 1.0))
+        self._info.add_provider(self._shards_info)
+        self._info.add_provider(self._metrics_info)
+        self._info.add_provider(lambda: self._cache_report)
+
+        self._watchdog = LoopWatchdog(self._watchdog_settings.get('interval', 1.0),
+                                      self._watchdog_settings.get('threshold', 0.25),
+                                      self._report_loop_lag)
+
+        if database_path != '':
+            self._database_controller = DatabaseController.from_settings(database_path,
+                                                                         self._database_settings,
+                                                                         self._metrics)
+            self.register_statements(self._database_controller.statements)
+            self.register_migrations(self._migrations)
+
+            self.log('Bot', 'Database opened with the "%s" profile', self._database_settings.get('profile', 'default'))
+
+        self._permissions = PermissionResolver(self._admins_id, self._database_controller)
+        self._throttler = Throttler(self._throttle_settings.get('sweep_interval', 60.0))
+
     # Getters e Setters
     @property
-    def custom_guilds(self) -> dict:
+    def custom_guilds(self) -> ShardedGuildRegistry:
         '''
         Getter dos servers.
         '''
 
         return self._custom_guilds
 
+    @property
+    def metrics(self) -> MetricsCollector:
+        '''
+        Getter do coletor de métricas.
+        '''
+
+        return self._metrics
+
+    @property
+    def dispatcher(self) -> MessageDispatcher:
+        '''
+        Getter do despachante de mensagens.
+        '''
+
+        return self._dispatcher
+
+    @property
+    def info(self) -> InfoCollector:
+        '''
+        Getter do coletor de informações.
+        '''
+
+        return self._info
+
+    @property
+    def cluster(self) -> ClusterClient | None:
+        '''
+        Getter do canal do cluster, se o bot roda em um.
+        '''
+
+        return self._cluster
+
+    @property
+    def permissions(self) -> PermissionResolver:
+        '''
+        Getter do resolvedor de permissões.
+        '''
+
+        return self._permissions
+
     @property
     def database_controller(self) -> DatabaseController | None:
         '''
@@ -106,6 +238,45 @@ class Bot(commands.Bot):
         self.log('Bot', 'Setting activity automatically')
         await self.set_activity()
 
+    @tasks.loop(seconds=60.0)
+    async def guild_eviction(self) -> None:
+        '''
+        Descarrega os servidores ociosos.
+        '''
+
+        evicted = await self._custom_guilds.evict_idle()
+
+        if evicted > 0:
+            self.log('Bot', 'Evicted %s idle guilds', evicted)
+
+    @tasks.loop(seconds=60.0)
+    async def metrics_dump(self) -> None:
+        '''
+        Escreve as métricas no arquivo configurado.
+        '''
+
+        await self.dump_metrics(self._metrics_settings['file'], self._metrics_settings.get('format', 'prometheus'))
+
+    @tasks.loop(seconds=5.0)
+    async def health_sample(self) -> None:
+        '''
+        Amostra a memória e o tamanho dos caches do discord.py.
+        '''
+
+        self._info.sample_memory()
+        self._cache_report = self.get_cache_report()
+
+    @tasks.loop(seconds=1.0)
+    async def loop_watchdog(self) -> None:
+        '''
+        Mede o atraso do loop.
+        '''
+
+        lag = self._watchdog.beat()
+
+        self._info.record_loop_lag(lag)
+        self._metrics.observe('loop', 'lag', lag)
+
     # Eventos
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -114,10 +285,38 @@ class Bot(commands.Bot):
         '''
 
         self.log('Bot', 'Ready')
+        self._info.set_guild_count(len(self.guilds))
         await self.prepare_data()
 
         self.activity.start()
 
+        if not self.health_sample.is_running():
+            self.health_sample.change_interval(seconds=self._info_settings.get('interval', 5.0))
+            self.health_sample.start()
+
+        if not self.loop_watchdog.is_running():
+            self.loop_watchdog.change_interval(seconds=self._watchdog.interval)
+            self.loop_watchdog.start()
+
+            if self._watchdog_settings.get('enabled', True):
+                self._watchdog.start()
+
+        if self._custom_guilds.idle_timeout > 0.0:
+            self.guild_eviction.start()
+
+        if self._metrics_settings.get('file', '') != '':
+            self.metrics_dump.change_interval(seconds=self._metrics_settings.get('interval', 60.0))
+            self.metrics_dump.start()
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id: int) -> None:
+        '''
+        Evento de "shard pronto".
+        '''
+
+        self.log('Bot', 'Shard %s ready', shard_id)
+        await self.prepare_shard(shard_id)
+
     @commands.Cog.listener()
     async def on_connect(self) -> None:
         '''
@@ -148,8 +347,9 @@ class Bot(commands.Bot):
         Evento para a entrada em um servidor.
         '''
 
-        self.add_guild(guild.id)
-        self.log('Bot', f'Joined guild {guild.name}.')
+        self._info.guild_joined()
+        await self.add_guild(guild.id)
+        self.log('Bot', 'Joined guild %s.', guild.name)
 
     @commands.Cog.listener()
     async def on_guild_remove(self, guild) -> None:
@@ -157,8 +357,23 @@ class Bot(commands.Bot):
         Evento para a saída de um servidor.
         '''
 
-        self.remove_guild(guild.id)
-        self.log('Bot', f'Left guild {guild.name}.')
+        self._info.guild_removed()
+        await self.remove_guild(guild.id)
+        self.log('Bot', 'Left guild %s.', guild.name)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after) -> None:
+        '''
+        Evento de mudança de estado de voz. Contabiliza as conexões de voz do bot.
+        '''
+
+        if self.user is None or member.id != self.user.id:
+            return
+
+        if before.channel is None and after.channel is not None:
+            self._info.voice_connected()
+        elif before.channel is not None and after.channel is None:
+            self._info.voice_disconnected()
 
     # Métodos
     @abstractmethod
@@ -167,27 +382,163 @@ class Bot(commands.Bot):
         Pré-setup.
         '''
 
+    async def migrate_database(self) -> None:
+        '''
+        Aplica as migrações pendentes do banco de dados.
+        '''
+
+        if self._database_controller is None:
+            return
+
+        async with self._migration_lock:
+            if self._migrated:
+                return
+
+            applied = await self._migrations.migrate(self._database_controller)
+            self._migrated = True
+
+        if applied > 0:
+            self.log('Bot', 'Applied %s database migrations', applied)
+
+    def register_migrations(self, migrations: MigrationEngine) -> None:
+        '''
+        Registra as migrações do banco de dados. Subclasses podem registrar as suas próprias.
+        '''
+
+        Guild.register_migrations(migrations)
+        PermissionResolver.register_migrations(migrations)
+
+    def register_statements(self, statements: StatementRegistry) -> None:
+        '''
+        Registra as instruções SQL nomeadas. Subclasses podem registrar as suas próprias.
+        '''
+
+        Guild.register_statements(statements)
+        PermissionResolver.register_statements(statements)
+
     @abstractmethod
-    def add_guild(self, guild_id: int) -> None:
+    def build_custom_guild(self, guild_id: int) -> Guild:
+        '''
+        Constrói um servidor personalizado, sem carregá-lo.
+        '''
+
+    async def add_guild(self, guild_id: int) -> None:
         '''
         Adiciona um servidor.
         '''
 
-    @abstractmethod
-    def remove_guild(self, guild_id: int) -> None:
+        await self._custom_guilds.add(await self._materialize_guild(guild_id))
+
+    async def remove_guild(self, guild_id: int) -> None:
         '''
         Remove um servidor.
         '''
 
-    def load_guilds(self) -> None:
+        known = guild_id in self._custom_guilds
+        guild = await self._custom_guilds.pop(guild_id)
+
+        if guild is None and known:
+            # Servidores fora da memória são removidos sem carregar os seus dados
+            guild = self.build_custom_guild(guild_id)
+
+        if guild is not None:
+            await guild.remove()
+
+        await self._permissions.forget_guild(guild_id)
+
+    async def load_guilds(self) -> None:
         '''
         Carrega os servidores.
         '''
 
         self.log('Bot', 'Loading guilds definitions...')
 
+        # Os servidores são agrupados por shard em uma única passagem
+        shard_guilds: dict[int, list[int]] = {shard_id: [] for shard_id in (self.shards or {0: None})}
+
         for guild in self.guilds:
-            self.add_guild(guild.id)
+            shard_guilds.setdefault(guild.shard_id, []).append(guild.id)
+
+        await asyncio.gather(*(self.prepare_shard(shard_id, guild_ids) for shard_id, guild_ids in shard_guilds.items()))
+
+    async def prepare_shard(self, shard_id: int, guild_ids: list[int] | None = None) -> None:
+        '''
+        Carrega os servidores de um shard uma única vez, aguardando a carga se ela já começou. Uma
+        carga que falhou é descartada, de forma que a próxima chamada tenta de novo.
+        '''
+
+        bootstrap = self._shard_bootstraps.get(shard_id)
+
+        if bootstrap is None:
+            bootstrap = self._shard_bootstraps[shard_id] = asyncio.ensure_future(self._bootstrap_shard(shard_id, guild_ids))
+            bootstrap.add_done_callback(lambda future: self._on_shard_bootstrap_done(shard_id, future))
+
+        await asyncio.shield(bootstrap)
+
+    def _on_shard_bootstrap_done(self, shard_id: int, bootstrap: asyncio.Future) -> None:
+        '''
+        Descarta a carga de um shard que falhou.
+        '''
+
+        if (bootstrap.cancelled() or bootstrap.exception() is not None) and self._shard_bootstraps.get(shard_id) is bootstrap:
+            del self._shard_bootstraps[shard_id]
+
+    async def _bootstrap_shard(self, shard_id: int, guild_ids: list[int] | None = None) -> None:
+        '''
+        Aplica as migrações pendentes e carrega os servidores de um shard.
+        '''
+
+        await self.migrate_database()
+
+        if guild_ids is None:
+            guild_ids = [guild.id for guild in self.guilds if guild.shard_id == shard_id]
+
+        await self.bootstrap_guilds(guild_ids, shard_id=shard_id)
+        self.log('Bot', 'Loaded shard %s with %s guilds', shard_id, len(guild_ids))
+
+    async def bootstrap_guilds(self, guild_ids: list[int], batch_size: int = 500, shard_id: int | None = None) -> None:
+        '''
+        Carrega vários servidores em lote.
+
+        As configurações de todos os servidores são inseridas em uma transação e lidas em uma
+        única consulta, restrita ao shard se ele for informado. Os servidores são construídos em
+        lotes, liberando o loop entre eles. No modo preguiçoso, os servidores são apenas
+        registrados e materializados no primeiro acesso.
+        '''
+
+        settings: dict[int, dict] = {}
+
+        if self._database_controller is not None:
+            await self._database_controller.executemany_named('guild_insert', [(guild_id,) for guild_id in guild_ids])
+
+        self._custom_guilds.register(guild_ids)
+
+        if self._custom_guilds.lazy:
+            self.log('Bot', 'Registered %s guilds for lazy loading', len(guild_ids))
+            return
+
+        if self._database_controller is not None:
+            if shard_id is None:
+                rows = await self._database_controller.fetchall_named('guild_select_all')
+            else:
+                rows = await self._database_controller.fetchall_named('guild_select_shard', (self.shard_count or 1, shard_id))
+
+            for row in rows:
+                settings[row['ID']] = dict(row)
+
+        for start in range(0, len(guild_ids), batch_size):
+            guilds = [self.build_custom_guild(guild_id) for guild_id in guild_ids[start:start + batch_size]]
+
+            await asyncio.gather(*(guild.load_settings(settings.get(guild.identification, {})) for guild in guilds))
+            await asyncio.gather(*(guild.load_data() for guild in guilds))
+
+            for guild in guilds:
+                await self._custom_guilds.add(guild)
+
+            self.log('Bot', 'Loaded %s of %s guilds', start + len(guilds), len(guild_ids))
+
+            # Libera o loop entre os lotes
+            await asyncio.sleep(0)
 
     async def prepare_data(self) -> None:
         '''
@@ -202,11 +553,12 @@ class Bot(commands.Bot):
         self.log('Bot', 'Waiting...')
         await self.wait_until_ready()
 
-        self.load_guilds()
+        await self.migrate_database()
+        await self.load_guilds()
 
         if self.user is not None:
-            self.log('Bot', f'{self._name} {self._version} ready to operate')
-            self.log('Bot', f'Logged as {self.user.name}, with the id: {self.user.id}')
+            self.log('Bot', '%s %s ready to operate', self._name, self._version)
+            self.log('Bot', 'Logged as %s, with the id: %s', self.user.name, self.user.id)
         else:
             self.log('Bot', 'Failed to get the user data')
 
@@ -251,7 +603,7 @@ class Bot(commands.Bot):
         internal_settings = self.load_internal_settings(path)
 
         if internal_settings is not None:
-            self._admins_id = list(map(int, internal_settings['adm_id']))
+            self._admins_id = set(map(int, internal_settings['adm_id']))
 
             if dev_env:
                 self._token = internal_settings['devenv_token']
@@ -259,9 +611,97 @@ class Bot(commands.Bot):
                 self._token = internal_settings['token']
 
             self._activities = internal_settings['activities']
+            self._database_settings = internal_settings.get('database', {})
+            self._log_pipeline.configure(internal_settings.get('logging', {}))
+            self._metrics_settings = internal_settings.get('metrics', {})
+            self._dispatcher_settings = internal_settings.get('dispatcher', {})
+            self._info_settings = internal_settings.get('info', {})
+            self._watchdog_settings = internal_settings.get('watchdog', {})
+            self._memory_settings = internal_settings.get('memory', {})
+            self._throttle_settings = internal_settings.get('throttle', {})
         else:
             self.log('Bot', 'Failed set internal definitions')
 
+    async def invoke(self, ctx: commands.Context) -> None:
+        '''
+        Invoca um comando, registrando a sua duração por comando e por cog.
+
+        Invocações limitadas pelas regras de throttle são descartadas sem resposta.
+        '''
+
+        if ctx.command is None:
+            await super().invoke(ctx)
+            return
+
+        if not self._throttler.acquire(ctx):
+            self._metrics.increment('throttled', ctx.command.qualified_name)
+            return
+
+        start = perf_counter()
+
+        try:
+            await super().invoke(ctx)
+        finally:
+            self._throttler.release(ctx)
+            elapsed = perf_counter() - start
+            command = ctx.command.qualified_name
+
+            self._metrics.observe('command', command, elapsed)
+            self._metrics.observe('command', 'all', elapsed)
+            self._metrics.observe('cog', ctx.cog.qualified_name if ctx.cog is not None else 'none', elapsed)
+            self._metrics.increment('commands', command)
+
+            if ctx.command_failed:
+                self._metrics.increment('command_errors', command)
+
+    async def dump_metrics(self, path: str, format_: str = 'prometheus') -> None:
+        '''
+        Escreve as métricas em um arquivo sem bloquear o loop.
+        '''
+
+        content = self._metrics.export(format_)
+        await asyncio.get_running_loop().run_in_executor(None, MetricsCollector.dump, path, content)
+
+    async def close(self) -> None:
+        '''
+        Encerra o bot e o banco de dados.
+        '''
+
+        # Os servidores e as escritas pendentes são persistidos mesmo se a desconexão falhar
+        try:
+            await self._dispatcher.close()
+            await super().close()
+        finally:
+            self._watchdog.stop()
+
+            try:
+                await self._custom_guilds.unload_all()
+            finally:
+                if self._database_controller is not None:
+                    await self._database_controller.close()
+
+                self.log('Bot', 'Closed')
+                self._log_pipeline.stop()
+
+    def attach_cluster(self, cluster: ClusterClient) -> None:
+        '''
+        Conecta o bot ao canal do cluster, registrando as operações de todo o cluster.
+        '''
+
+        self._cluster = cluster
+        self._cluster.register('info', self.get_info)
+        self._cluster.register('off', self.close)
+
+    async def start(self, token: str, *, reconnect: bool = True) -> None:
+        '''
+        Inicia o bot e, se houver, o canal do cluster.
+        '''
+
+        if self._cluster is not None:
+            self._cluster.start(asyncio.get_running_loop())
+
+        await super().start(token, reconnect=reconnect)
+
     def run(self, *args: tuple, **kwargs: tuple) -> None:
         '''
         Roda o bot.
@@ -276,37 +716,110 @@ class Bot(commands.Bot):
         Checa se o autor é um administrador.
         '''
 
-        return author_id in self._admins_id
+        return self._permissions.is_global_admin(author_id)
 
     def get_info(self) -> dict:
         '''
         Retorna um dicionário com informações.
+
+        O dicionário é um snapshot compartilhado e não deve ser modificado.
+        '''
+
+        return self._info.snapshot()
+
+    def _report_loop_lag(self, lag: float, stack: list[str]) -> None:
+        '''
+        Registra um bloqueio do loop, com a pilha capturada durante o bloqueio, se houver.
+        '''
+
+        self._metrics.increment('loop_stalls', 'all')
+
+        if not stack:
+            self.log('Watchdog', 'Event loop lagged %.1f ms', lag * 1000, level=logging.WARNING)
+            return
+
+        self.log('Watchdog',
+                 'Event loop blocked for %.1f ms at %s\n%s',
+                 lag * 1000,
+                 stack[-1].strip().splitlines()[0],
+                 ''.join(stack),
+                 level=logging.WARNING)
+
+    def get_cache_report(self) -> dict:
+        '''
+        Retorna o número de objetos em cada cache do discord.py.
+        '''
+
+        # Os tamanhos são lidos dos dicionários internos para não copiar os caches em listas
+        connection = self._connection
+
+        return {'Memory profile': self._memory_settings.get('profile', 'default'),
+                'Cached guilds': len(connection._guilds),  # pylint: disable=protected-access
+                'Cached users': len(connection._users),  # pylint: disable=protected-access
+                'Cached members': sum(len(guild._members) for guild in connection._guilds.values()),  # pylint: disable=protected-access
+                'Cached messages': len(connection._messages) if connection._messages is not None else 0}  # pylint: disable=protected-access
+
+    def _shards_info(self) -> dict:
+        '''
+        Retorna as entradas de shards das informações.
         '''
 
-        info = {'Name': self._name,
-                'Version': self._version,
-                'HTTP loop': self.http,
-                'Latency': self.latency,
-                'Guild count': len(self.guilds),
-                'Voice clients': self.voice_clients,
-                'Uptime': datetime.now() - self._init_time,
-                'Platform': platform.platform(),
-                'Processor': platform.processor(),
-                'Architecture': platform.machine(),
-                'Python version': platform.python_version()}
+        latencies = ', '.join(f'{shard_id}: {latency * 1000:.1f} ms' for shard_id, latency in self.latencies)
+
+        return {'Shard count': self.shard_count or 1,
+                'Shard latencies': latencies or '-'}
+
+    def _metrics_info(self) -> dict:
+        '''
+        Retorna as entradas de métricas das informações.
+        '''
+
+        info: dict = {}
+        command_latency = self._metrics.get_summary('command', 'all')
+
+        if command_latency is not None:
+            info['Commands executed'] = command_latency['count']
+            info['Command latency (p50/p95/p99)'] = (f'{command_latency["p50"] * 1000:.1f}/'
+                                                     f'{command_latency["p95"] * 1000:.1f}/'
+                                                     f'{command_latency["p99"] * 1000:.1f} ms')
+
+        info['Command errors'] = self._metrics.get_counter_total('command_errors')
+        info['Rate limit hits'] = self._metrics.get_counter_total('rate_limit_hits')
+        info['Event loop stalls'] = self._metrics.get_counter_total('loop_stalls')
+        info['Throttled commands'] = self._metrics.get_counter_total('throttled')
 
         return info
 
-    def get_custom_guild(self, guild_id: int) -> Guild:
+    async def get_custom_guild(self, guild_id: int) -> Guild:
+        '''
+        Retorna um server personalizado, carregando-o se necessário.
+        '''
+
+        return await self._custom_guilds.get(guild_id)
+
+    async def _materialize_guild(self, guild_id: int) -> Guild:
+        '''
+        Constrói e carrega um server personalizado.
+        '''
+
+        guild = self.build_custom_guild(guild_id)
+        await guild.load()
+
+        return guild
+
+    @property
+    def log_pipeline(self) -> LogPipeline:
         '''
-        Retorna um server personalizado.
+        Getter do pipeline de log.
         '''
 
-        return self._custom_guilds[str(guild_id)]
+        return self._log_pipeline
 
-    def log(self, origin: str, message: str) -> None:
+    def log(self, origin: str, message: str, *args: object, level: int = logging.INFO) -> None:
         '''
-        Exibe uma mensagem no console.
+        Registra uma mensagem de forma assíncrona.
+
+        Os argumentos são interpolados com % apenas se a mensagem passar pelo filtro da origem.
         '''
 
-        print(f"[{datetime.now()}][{origin}]: {message}")
+        self._log_pipeline.log(origin, message, *args, level=level)
@@ -7,35 +7,40 @@ Módulo para os servers.
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import logging
+
 from abc import abstractmethod
 
 import discord
 
+from discpybotframe.internals.migrations import Migration
+
 if TYPE_CHECKING:
     from discpybotframe.discord.bot import Bot
+    from discpybotframe.internals.database import StatementRegistry
+    from discpybotframe.internals.migrations import MigrationEngine
 
 
 class Guild():
 
     '''
     Definição de um server.
+
+    O discord.Guild não é guardado: ele é obtido do cache do bot pelo ID a cada acesso.
     '''
 
+    __slots__ = ('_identification', '_bot', '_settings')
+
     # Atributos privados
     _identification: int
     _bot: Bot
-    _guild: discord.Guild
+    _settings: dict
 
     # Construtor
     def __init__(self, identification: int, bot: Bot) -> None:
         self._identification = identification
         self._bot = bot
-        self._guild = self._bot.get_guild(self._identification) # type: ignore
-
-        self.load_settings()
-        self.load_data()
-
-        self._bot.log('Guild', f'Guild {self._identification} initialized')
+        self._settings = {}
 
     # Getters e Setters
     @property
@@ -47,67 +52,139 @@ class Guild():
         return self._bot
 
     @property
-    def guild(self):
+    def guild(self) -> discord.Guild | None:
         '''
         Getter do server.
         '''
 
-        return self._guild
+        return self._bot.get_guild(self._identification)
 
-    def load(self) -> None:
+    @property
+    def identification(self) -> int:
+        '''
+        Getter do ID do server.
+        '''
+
+        return self._identification
+
+    @property
+    def settings(self) -> dict:
+        '''
+        Getter das configurações do server.
+        '''
+
+        return self._settings
+
+    async def load(self, settings: dict | None = None) -> None:
         '''
         Carrega informações na ordem correta.
         '''
 
-        self.load_settings()
-        self.load_data()
+        await self.load_settings(settings)
+        await self.load_data()
+
+        self._bot.log('Guild', 'Guild %s initialized', self._identification, level=logging.DEBUG)
+
+    async def unload(self) -> None:
+        '''
+        Persiste os dados antes do servidor ser descarregado da memória.
+        '''
+
+        await self.save_data()
+        self._bot.permissions.unload_guild(self._identification)
 
-    def remove(self) -> None:
+        self._bot.log('Guild', 'Guild %s unloaded', self._identification, level=logging.DEBUG)
+
+    async def remove(self) -> None:
         '''
         Remove informações na ordem correta.
         '''
 
-        self.remove_data()
-        self.remove_settings()
+        await self.remove_data()
+        await self.remove_settings()
 
     # Métodos
-    def load_settings(self) -> None:
+    @staticmethod
+    def register_migrations(migrations: MigrationEngine) -> None:
+        '''
+        Registra as migrações da tabela de servidores.
+        '''
+
+        migrations.register(Migration('discpybotframe', 1, ('''
+                                                                CREATE TABLE IF NOT EXISTS Guild (
+                                                                    ID INTEGER PRIMARY KEY
+                                                                );
+                                                             ''',)))
+
+    @staticmethod
+    def register_statements(statements: StatementRegistry) -> None:
+        '''
+        Registra as instruções da tabela de servidores.
+        '''
+
+        statements.register('guild_insert', '''
+                                                INSERT OR IGNORE INTO Guild (ID)
+                                                VALUES (?);
+                                            ''')
+
+        statements.register('guild_select', '''
+                                                SELECT * FROM Guild
+                                                WHERE ID = ?;
+                                            ''')
+
+        statements.register('guild_select_all', '''
+                                                    SELECT * FROM Guild;
+                                                ''')
+
+        statements.register('guild_select_shard', '''
+                                                      SELECT * FROM Guild
+                                                      WHERE (ID >> 22) % ? = ?;
+                                                  ''')
+
+        statements.register('guild_delete', '''
+                                                DELETE FROM Guild
+                                                WHERE ID = ?;
+                                            ''')
+
+    async def load_settings(self, settings: dict | None = None) -> None:
         '''
         Lê as configurações do servidor.
+
+        Se as configurações já foram carregadas em lote, elas são usadas sem acessar o banco. A
+        linha do servidor só é inserida se ainda não existir.
         '''
 
-        if self.bot.database_controller is not None:
-            query = f'''
-                        INSERT OR IGNORE INTO Guild (ID)
-                        VALUES ({self._identification});
-                    '''
+        if settings is not None:
+            self._settings = settings
+        elif self.bot.database_controller is not None:
+            row = await self.bot.database_controller.fetchone_named('guild_select', (self._identification,))
+
+            if row is None:
+                await self.bot.database_controller.queue_write_named('guild_insert', (self._identification,))
 
-            self.bot.database_controller.cursor.execute(query)
-            self.bot.database_controller.connection.commit()
+            self._settings = dict(row) if row is not None else {}
 
     @abstractmethod
-    def load_data(self) -> None:
+    async def load_data(self) -> None:
         '''
         Lê os dados do servidor.
         '''
 
-    def remove_settings(self) -> None:
+    async def save_data(self) -> None:
+        '''
+        Persiste os dados do servidor. Por padrão, não faz nada.
+        '''
+
+    async def remove_settings(self) -> None:
         '''
         Remove as configurações do servidor.
         '''
 
         if self.bot.database_controller is not None:
-            query = f'''
-                        DELETE FROM Guild
-                        WHERE ID = {self._identification};
-                    '''
-
-            self.bot.database_controller.cursor.execute(query)
-            self.bot.database_controller.connection.commit()
-
+            await self.bot.database_controller.queue_write_named('guild_delete', (self._identification,))
 
     @abstractmethod
-    def remove_data(self) -> None:
+    async def remove_data(self) -> None:
         '''
         Remove os dados do servidor.
         '''
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para o agendamento da reprodução de áudios.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import asyncio
+import logging
+import threading
+
+from collections import deque
+
+import discord
+
+if TYPE_CHECKING:
+    from discpybotframe.discord.voice import VoiceController
+
+
+class ChainedAudio(discord.AudioSource):
+
+    '''
+    Fonte de áudio que reproduz várias fontes Opus em sequência sem reiniciar o player.
+
+    A fonte é lida pela thread do player. Depois que ela termina, novas fontes são recusadas.
+    '''
+
+    _sources: deque[discord.AudioSource]
+    _lock: threading.Lock
+    _closed: bool
+    _loop: asyncio.AbstractEventLoop
+    _advanced: asyncio.Event
+
+    def __init__(self, source: discord.AudioSource, loop: asyncio.AbstractEventLoop, advanced: asyncio.Event) -> None:
+        self._sources = deque((source,))
+        self._lock = threading.Lock()
+        self._closed = False
+        self._loop = loop
+        self._advanced = advanced
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def append(self, source: discord.AudioSource) -> bool:
+        '''
+        Adiciona uma fonte ao final da sequência. Retorna False se a reprodução já terminou.
+        '''
+
+        with self._lock:
+            if self._closed:
+                return False
+
+            self._sources.append(source)
+
+        return True
+
+    def skip(self) -> None:
+        '''
+        Pula a fonte atual.
+        '''
+
+        with self._lock:
+            if self._sources:
+                self._sources.popleft().cleanup()
+
+        self._loop.call_soon_threadsafe(self._advanced.set)
+
+    def truncate(self) -> None:
+        '''
+        Descarta as fontes após a atual.
+        '''
+
+        with self._lock:
+            while len(self._sources) > 1:
+                self._sources.pop().cleanup()
+
+        self._loop.call_soon_threadsafe(self._advanced.set)
+
+    def close(self) -> None:
+        '''
+        Impede que novas fontes sejam adicionadas.
+        '''
+
+        with self._lock:
+            self._closed = True
+
+    def read(self) -> bytes:
+        while True:
+            with self._lock:
+                if not self._sources:
+                    self._closed = True
+                    return b''
+
+                source = self._sources[0]
+
+            packet = source.read()
+
+            if packet:
+                return packet
+
+            with self._lock:
+                if self._sources and self._sources[0] is source:
+                    self._sources.popleft()
+
+            source.cleanup()
+            self._loop.call_soon_threadsafe(self._advanced.set)
+
+    def is_opus(self) -> bool:
+        return True
+
+
+class PlaybackScheduler():
+
+    '''
+    Fila de reprodução de um servidor.
+
+    Enquanto uma fonte toca, a próxima da fila já é preparada, de forma que a troca entre faixas
+    não espera pelo ffmpeg. No modo gapless, as faixas são encadeadas em uma única fonte e tocadas
+    sem reiniciar o player. A fila é limitada a max_queue faixas.
+    '''
+
+    _voice_controller: VoiceController
+    _guild_id: int
+    _queue: asyncio.Queue[str]
+    _gapless: bool
+    _prepared: asyncio.Future | None
+    _worker: asyncio.Task | None
+    _chain: ChainedAudio | None
+    _advanced: asyncio.Event
+
+    def __init__(self, voice_controller: VoiceController, guild_id: int, max_queue: int = 32, gapless: bool = False) -> None:
+        self._voice_controller = voice_controller
+        self._guild_id = guild_id
+        self._queue = asyncio.Queue(max(max_queue, 1))
+        self._gapless = gapless
+        self._prepared = None
+        self._worker = None
+        self._chain = None
+        self._advanced = asyncio.Event()
+
+    @property
+    def queue_length(self) -> int:
+        '''
+        Getter do número de faixas aguardando reprodução.
+        '''
+
+        return self._queue.qsize() + (1 if self._prepared is not None else 0)
+
+    def enqueue(self, source: str) -> bool:
+        '''
+        Adiciona uma faixa à fila. Retorna False se a fila estiver cheia.
+        '''
+
+        try:
+            self._queue.put_nowait(source)
+        except asyncio.QueueFull:
+            return False
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+        return True
+
+    def play_now(self, source: str) -> None:
+        '''
+        Descarta a fila e a faixa atual e toca a faixa imediatamente.
+        '''
+
+        self.clear()
+        self.enqueue(source)
+        self.skip()
+
+    def skip(self) -> None:
+        '''
+        Pula a faixa atual.
+        '''
+
+        if self._chain is not None:
+            self._chain.skip()
+            return
+
+        voice_client = self._voice_controller.get_voice_client(self._guild_id)
+
+        if voice_client is not None and voice_client.is_playing():
+            voice_client.stop()
+
+    def clear(self) -> None:
+        '''
+        Esvazia a fila, incluindo a faixa preparada e as faixas encadeadas após a atual.
+        '''
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        if self._prepared is not None:
+            # Uma faixa já preparada pode ter um processo do ffmpeg em execução
+            if self._prepared.done() and not self._prepared.cancelled() and self._prepared.exception() is None:
+                self._prepared.result().cleanup()
+
+            self._prepared.cancel()
+            self._prepared = None
+
+        if self._chain is not None:
+            self._chain.truncate()
+
+    async def stop(self) -> None:
+        '''
+        Esvazia a fila, encerra a reprodução e o agendador.
+        '''
+
+        self.clear()
+        self.skip()
+
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def _run(self) -> None:
+        '''
+        Consome a fila enquanto houver faixas.
+        '''
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                audio = await self._next_audio()
+            except Exception as error:  # pylint: disable=broad-except
+                self._voice_controller.bot.log('PlaybackScheduler',
+                                               '<playback> failed to prepare audio: %s',
+                                               error,
+                                               level=logging.WARNING)
+                continue
+
+            # A faixa preparada foi descartada por clear
+            if audio is None:
+                continue
+
+            voice_client = self._voice_controller.get_voice_client(self._guild_id)
+
+            if voice_client is None:
+                self.clear()
+                continue
+
+            if self._gapless:
+                await self._play_chained(voice_client, audio, loop)
+            else:
+                await self._play_single(voice_client, audio, loop)
+
+    async def _play_single(self,
+                           voice_client: discord.VoiceClient,
+                           audio: discord.AudioSource,
+                           loop: asyncio.AbstractEventLoop) -> None:
+        '''
+        Toca uma faixa e prepara a próxima enquanto ela toca.
+        '''
+
+        finished = loop.create_future()
+
+        if voice_client.is_playing():
+            voice_client.stop()
+
+        voice_client.play(audio, after=lambda _: loop.call_soon_threadsafe(_resolve, finished))
+
+        self._prefetch()
+
+        await finished
+
+    async def _play_chained(self,
+                            voice_client: discord.VoiceClient,
+                            audio: discord.AudioSource,
+                            loop: asyncio.AbstractEventLoop) -> None:
+        '''
+        Encadeia uma faixa na fonte atual ou inicia uma nova fonte encadeada.
+        '''
+
+        # Mantém no máximo uma faixa encadeada após a atual
+        while self._chain is not None and len(self._chain) > 1:
+            self._advanced.clear()
+            await self._advanced.wait()
+
+        if self._chain is not None and self._chain.append(audio):
+            return
+
+        chain = self._chain = ChainedAudio(audio, loop, self._advanced)
+
+        def after(_) -> None:
+            chain.close()
+            loop.call_soon_threadsafe(self._advanced.set)
+
+        if voice_client.is_playing():
+            voice_client.stop()
+
+        voice_client.play(chain, after=after)
+
+    async def _next_audio(self) -> discord.AudioSource | None:
+        '''
+        Retorna a próxima faixa preparada, aguardando a fila se necessário. Retorna None se a
+        faixa foi descartada durante a preparação.
+        '''
+
+        if self._prepared is None:
+            source = await self._queue.get()
+            self._prepared = asyncio.ensure_future(self._voice_controller.audio_cache.get_audio_source(source))
+
+        prepared = self._prepared
+
+        try:
+            return await asyncio.shield(prepared)
+        except asyncio.CancelledError:
+            if prepared.cancelled():
+                return None
+
+            raise
+        finally:
+            if self._prepared is prepared:
+                self._prepared = None
+
+    def _prefetch(self) -> None:
+        '''
+        Começa a preparar a próxima faixa da fila.
+        '''
+
+        if self._prepared is None and not self._queue.empty():
+            source = self._queue.get_nowait()
+            self._prepared = asyncio.ensure_future(self._voice_controller.audio_cache.get_audio_source(source))
+
+
+def _resolve(future: asyncio.Future) -> None:
+    '''
+    Conclui um future, se ele ainda estiver pendente.
+    '''
+
+    if not future.done():
+        future.set_result(None)
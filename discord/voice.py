@@ -5,111 +5,348 @@ Módulo para o controle de conexões aos canais de voz e à reprodução de áud
 '''
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable
+
+import asyncio
 
 import discord
 
+from discpybotframe.discord.audio_cache import AudioCache
+from discpybotframe.discord.playback import PlaybackScheduler
+
 if TYPE_CHECKING:
     from discpybotframe.discord.bot import Bot
 
 
+class BulkOperationResult():
+
+    '''
+    Resultado de uma operação em lote sobre membros.
+    '''
+
+    _succeeded: list[discord.Member]
+    _failed: dict[discord.Member, Exception]
+
+    def __init__(self) -> None:
+        self._succeeded = []
+        self._failed = {}
+
+    @property
+    def succeeded(self) -> list[discord.Member]:
+        '''
+        Getter dos membros processados com sucesso.
+        '''
+
+        return self._succeeded
+
+    @property
+    def failed(self) -> dict[discord.Member, Exception]:
+        '''
+        Getter dos membros que falharam, com as respectivas exceções.
+        '''
+
+        return self._failed
+
+    @property
+    def total(self) -> int:
+        '''
+        Getter do número de membros processados.
+        '''
+
+        return len(self._succeeded) + len(self._failed)
+
+
 class VoiceController():
 
     '''
     Controlador de voz.
 
-    Atualmente, o controlador de voz suporta apenas um canal de voz.
+    Mantém um cliente de voz por servidor, indexado pelo ID do servidor. Conexões e desconexões
+    de um mesmo servidor são serializadas, enquanto servidores diferentes operam em paralelo.
+
+    Os áudios são reproduzidos a partir de um cache de pacotes Opus, compartilhado entre servidores,
+    por meio de uma fila de reprodução por servidor.
     '''
 
-    _bot: Bot
+    __slots__ = ('_bot', '_voice_clients', '_locks', '_audio_cache', '_schedulers', '_max_queue', '_gapless')
 
-    def __init__(self, bot: Bot) -> None:
+    _bot: Bot
+    _voice_clients: dict[int, discord.VoiceClient]
+    _locks: dict[int, asyncio.Lock]
+    _audio_cache: AudioCache
+    _schedulers: dict[int, PlaybackScheduler]
+    _max_queue: int
+    _gapless: bool
+
+    def __init__(self,
+                 bot: Bot,
+                 audio_cache_bytes: int = 64 * 1024 * 1024,
+                 max_queue: int = 32,
+                 gapless: bool = False) -> None:
         self._bot = bot
+        self._voice_clients = {}
+        self._locks = {}
+        self._audio_cache = AudioCache(audio_cache_bytes)
+        self._schedulers = {}
+        self._max_queue = max_queue
+        self._gapless = gapless
+
+    @property
+    def bot(self) -> Bot:
+        '''
+        Getter do bot.
+        '''
+
+        return self._bot
+
+    @property
+    def audio_cache(self) -> AudioCache:
+        '''
+        Getter do cache de áudios.
+        '''
+
+        return self._audio_cache
+
+    @property
+    def guild_ids(self) -> list[int]:
+        '''
+        Getter dos servidores com clientes de voz conectados.
+        '''
+
+        return [guild_id for guild_id in list(self._voice_clients) if self.get_voice_client(guild_id) is not None]
+
+    def get_voice_client(self, guild_id: int) -> discord.VoiceClient | None:
+        '''
+        Retorna o cliente de voz conectado de um servidor.
+        '''
+
+        voice_client = self._voice_clients.get(guild_id)
+
+        if voice_client is not None and not voice_client.is_connected():
+            # O cliente foi desconectado externamente
+            del self._voice_clients[guild_id]
+            return None
+
+        return voice_client
+
+    def get_scheduler(self, guild_id: int) -> PlaybackScheduler:
+        '''
+        Retorna a fila de reprodução de um servidor, criando-a se necessário.
+        '''
+
+        scheduler = self._schedulers.get(guild_id)
+
+        if scheduler is None:
+            scheduler = self._schedulers[guild_id] = PlaybackScheduler(self, guild_id, self._max_queue, self._gapless)
+
+        return scheduler
+
+    def play_audio(self, guild_id: int, source: str) -> None:
+        '''
+        Toca um áudio imediatamente, interrompendo a faixa atual e descartando a fila.
+        '''
+
+        voice_client = self.get_voice_client(guild_id)
 
-    def play_audio(self, source: str) -> None:
+        self._bot.log('VoiceController', '<play_audio> Playing audio on voice client %s', voice_client)
+
+        if voice_client is not None:
+            self.get_scheduler(guild_id).play_now(source)
+
+    def enqueue_audio(self, guild_id: int, source: str) -> bool:
         '''
-        Toca um áudio.
+        Adiciona um áudio à fila do servidor. Retorna False se a fila estiver cheia.
         '''
 
-        voice_client: discord.VoiceClient | None = None
+        self._bot.log('VoiceController', '<enqueue_audio> Enqueuing audio on guild %s', guild_id)
+
+        if self.get_voice_client(guild_id) is None:
+            return False
 
-        if len(self._bot.voice_clients) > 0:
-            voice_client = self._bot.voice_clients[0] # type: ignore
+        return self.get_scheduler(guild_id).enqueue(source)
 
-        self._bot.log('VoiceController', f'<play_audio> Playing audio on voice client {voice_client}')
+    def skip_audio(self, guild_id: int) -> None:
+        '''
+        Pula a faixa atual do servidor.
+        '''
 
-        if voice_client is not None and voice_client.is_connected():
-            if voice_client.is_playing():
-                voice_client.stop()
+        scheduler = self._schedulers.get(guild_id)
 
-            voice_client.play(discord.FFmpegPCMAudio(source=source))
+        if scheduler is not None:
+            scheduler.skip()
 
-    async def connect(self, voice_channel: discord.VoiceChannel) -> None:
+    async def connect(self, voice_channel: discord.VoiceChannel) -> discord.VoiceClient | None:
         '''
-        Conecta-se a um canal.
+        Conecta-se a um canal. Se já houver uma conexão no servidor, ela é movida para o canal.
         '''
 
-        voice_client: discord.VoiceClient | None = None
+        self._bot.log('VoiceController', '<connect> connecting to voice channel %s', voice_channel)
+
+        if voice_channel is None:
+            return None
 
-        if len(self._bot.voice_clients) > 0:
-            voice_client = self._bot.voice_clients[0] # type: ignore
+        guild_id = voice_channel.guild.id
 
-        self._bot.log('VoiceController', f'<connect> connecting to voice channel {voice_channel}')
+        async with self._get_lock(guild_id):
+            voice_client = self.get_voice_client(guild_id)
 
-        if voice_channel is not None and voice_client is None:
-            voice_client = await voice_channel.connect()
+            if voice_client is None:
+                voice_client = await voice_channel.connect()
+                self._voice_clients[guild_id] = voice_client  # type: ignore
+            elif voice_client.channel != voice_channel:
+                await voice_client.move_to(voice_channel)
 
-            if voice_client is not None and voice_client.is_connected():
-                if voice_client.is_playing():
-                    voice_client.stop()
+        return voice_client
 
-    async def disconnect(self) -> None:
+    async def disconnect(self, guild_id: int) -> None:
         '''
-        Desconecta-se de um canal.
+        Desconecta-se do canal de um servidor.
         '''
 
-        voice_client: discord.VoiceClient | None = None
+        async with self._get_lock(guild_id):
+            voice_client = self.get_voice_client(guild_id)
 
-        if len(self._bot.voice_clients) > 0:
-            voice_client = self._bot.voice_clients[0] # type: ignore
+            self._bot.log('VoiceController', '<disconnect> disconnecting voice client %s', voice_client)
 
-        self._bot.log('VoiceController', f'<disconnect> disconnecting voice client {voice_client}')
+            scheduler = self._schedulers.pop(guild_id, None)
 
-        if voice_client is not None and voice_client.is_connected():
-            await voice_client.disconnect()
+            if scheduler is not None:
+                await scheduler.stop()
 
-    async def get_members(self) -> list[discord.Member]:
+            if voice_client is not None:
+                await voice_client.disconnect()
+
+            self._voice_clients.pop(guild_id, None)
+
+    async def disconnect_all(self) -> None:
         '''
-        Retorna uma lista com todos os membros de um canal.
+        Desconecta-se de todos os canais.
         '''
 
-        voice_client: discord.VoiceClient | None = None
+        await asyncio.gather(*(self.disconnect(guild_id) for guild_id in list(self._voice_clients)))
+
+    async def get_members(self, guild_id: int) -> list[discord.Member]:
+        '''
+        Retorna uma lista com todos os membros do canal de um servidor.
+        '''
 
-        if len(self._bot.voice_clients) > 0:
-            voice_client = self._bot.voice_clients[0] # type: ignore
+        voice_client = self.get_voice_client(guild_id)
 
         self._bot.log('VoiceController',
-                      f'<get_members> getting members from channel in voice client {voice_client}')
+                      '<get_members> getting members from channel in voice client %s',
+                      voice_client)
 
-        if voice_client is not None and voice_client.is_connected():
+        if voice_client is not None:
             return voice_client.channel.members
 
         return []
 
-    async def remove_all_members(self) -> None:
+    async def remove_all_members(self, guild_id: int) -> BulkOperationResult:
         '''
-        Remove todos os membros de um canal.
+        Remove todos os membros do canal de um servidor.
         '''
 
-        voice_client: discord.VoiceClient | None = None
+        self._bot.log('VoiceController',
+                      '<remove_all_members> removing all members from channel in voice channel %s',
+                      self.get_voice_client(guild_id))
 
-        if len(self._bot.voice_clients) > 0:
-            voice_client = self._bot.voice_clients[0] # type: ignore
+        return await self.move_members(guild_id, None)
 
-        self._bot.log('VoiceController',
-                      f'<remove_all_members> removing all members from channel in voice channel {voice_client}')
+    async def move_members(self,
+                           guild_id: int,
+                           channel: discord.VoiceChannel | None,
+                           members: Iterable[discord.Member] | None = None,
+                           progress: Callable[[int, int], None] | None = None) -> BulkOperationResult:
+        '''
+        Move os membros para um canal, ou os desconecta se o canal for None. Por padrão, usa os
+        membros do canal do servidor, exceto o bot.
+        '''
+
+        return await self.bulk_member_operation(self._resolve_members(guild_id, members),
+                                                lambda member: member.move_to(channel),
+                                                progress=progress)
+
+    async def mute_members(self,
+                           guild_id: int,
+                           mute: bool = True,
+                           members: Iterable[discord.Member] | None = None,
+                           progress: Callable[[int, int], None] | None = None) -> BulkOperationResult:
+        '''
+        Silencia ou reativa o microfone dos membros no servidor.
+        '''
+
+        return await self.bulk_member_operation(self._resolve_members(guild_id, members),
+                                                lambda member: member.edit(mute=mute),
+                                                progress=progress)
+
+    async def deafen_members(self,
+                             guild_id: int,
+                             deafen: bool = True,
+                             members: Iterable[discord.Member] | None = None,
+                             progress: Callable[[int, int], None] | None = None) -> BulkOperationResult:
+        '''
+        Ensurdece ou reativa o áudio dos membros no servidor.
+        '''
+
+        return await self.bulk_member_operation(self._resolve_members(guild_id, members),
+                                                lambda member: member.edit(deafen=deafen),
+                                                progress=progress)
+
+    @staticmethod
+    async def bulk_member_operation(members: list[discord.Member],
+                                    operation: Callable[[discord.Member], Awaitable],
+                                    concurrency: int = 5,
+                                    progress: Callable[[int, int], None] | None = None) -> BulkOperationResult:
+        '''
+        Aplica uma operação a vários membros em paralelo.
+
+        No máximo concurrency requisições ficam em andamento ao mesmo tempo, e os rate limits de
+        cada rota continuam sendo respeitados pelo cliente HTTP do discord.py. A função progress,
+        se informada, recebe o número de membros processados e o total após cada membro.
+        '''
+
+        result = BulkOperationResult()
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def run(member: discord.Member) -> None:
+            async with semaphore:
+                try:
+                    await operation(member)
+                except discord.HTTPException as error:
+                    result.failed[member] = error
+                else:
+                    result.succeeded.append(member)
+
+            if progress is not None:
+                progress(result.total, len(members))
+
+        await asyncio.gather(*(run(member) for member in members))
+
+        return result
+
+    def _resolve_members(self, guild_id: int, members: Iterable[discord.Member] | None) -> list[discord.Member]:
+        '''
+        Retorna os membros informados ou, por padrão, os membros do canal do servidor, exceto o bot.
+        '''
+
+        if members is not None:
+            return list(members)
+
+        voice_client = self.get_voice_client(guild_id)
+
+        if voice_client is None:
+            return []
+
+        return [member for member in voice_client.channel.members if member.id != self._bot.user.id]  # type: ignore
+
+    def _get_lock(self, guild_id: int) -> asyncio.Lock:
+        '''
+        Retorna o lock de conexão de um servidor.
+        '''
+
+        lock = self._locks.get(guild_id)
+
+        if lock is None:
+            lock = self._locks[guild_id] = asyncio.Lock()
 
-        if voice_client is not None and voice_client.is_connected():
-            for member in voice_client.channel.members:
-                if member.id != self._bot.user.id:  # type: ignore
-                    await member.move_to(None)
+        return lock
@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para a execução do bot em vários processos.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import threading
+
+from itertools import count
+from multiprocessing.connection import Connection, wait
+from time import monotonic
+
+from discpybotframe.internals.logger import LogPipeline
+
+if TYPE_CHECKING:
+    from discpybotframe.discord.bot import Bot
+
+
+_logger = logging.LoggerAdapter(logging.getLogger('discpybotframe.Cluster'), {'origin': 'Cluster'})
+
+
+class ClusterClient():
+
+    '''
+    Canal de IPC de um processo do cluster.
+
+    As mensagens do supervisor são lidas por uma thread em segundo plano e tratadas no loop do bot.
+    Operações registradas com register podem ser chamadas em todos os processos com request, que
+    aguarda as respostas, ou com notify, que não aguarda. O supervisor responde no máximo em
+    ClusterSupervisor.REQUEST_TIMEOUT segundos; REQUEST_TIMEOUT protege contra um supervisor que
+    não responde.
+    '''
+
+    REQUEST_TIMEOUT = 15.0
+
+    _connection: Connection
+    _worker_id: int
+    _handlers: dict[str, Callable[[], Any]]
+    _pending: dict[int, asyncio.Future]
+    _counter: count
+    _loop: asyncio.AbstractEventLoop | None
+    _thread: threading.Thread | None
+
+    def __init__(self, connection: Connection, worker_id: int) -> None:
+        self._connection = connection
+        self._worker_id = worker_id
+        self._handlers = {}
+        self._pending = {}
+        self._counter = count()
+        self._loop = None
+        self._thread = None
+
+    @property
+    def worker_id(self) -> int:
+        '''
+        Getter do índice do processo no cluster.
+        '''
+
+        return self._worker_id
+
+    def register(self, operation: str, handler: Callable[[], Any]) -> None:
+        '''
+        Registra o tratador de uma operação. O tratador pode ser uma função ou uma corrotina.
+        '''
+
+        self._handlers[operation] = handler
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        '''
+        Inicia a thread de leitura.
+        '''
+
+        if self._thread is not None:
+            return
+
+        self._loop = loop
+        self._thread = threading.Thread(target=self._read, name='ClusterClient', daemon=True)
+        self._thread.start()
+
+    async def request(self, operation: str, timeout: float | None = None) -> dict[int, Any]:
+        '''
+        Executa uma operação em todos os processos e retorna as respostas, indexadas por processo.
+        Processos que não respondem a tempo têm a resposta None. Lança asyncio.TimeoutError se o
+        supervisor não responder em timeout segundos (REQUEST_TIMEOUT por padrão).
+        '''
+
+        request_id = next(self._counter)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            self._connection.send(('request', request_id, operation))
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.REQUEST_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def notify(self, operation: str) -> None:
+        '''
+        Executa uma operação em todos os processos, sem aguardar as respostas.
+        '''
+
+        self._connection.send(('request', None, operation))
+
+    def _read(self) -> None:
+        '''
+        Lê as mensagens do supervisor até o canal ser fechado.
+        '''
+
+        assert self._loop is not None
+
+        while True:
+            try:
+                message = self._connection.recv()
+            except (EOFError, OSError):
+                break
+
+            self._loop.call_soon_threadsafe(self._dispatch, message)
+
+    def _dispatch(self, message: tuple) -> None:
+        '''
+        Trata uma mensagem do supervisor.
+        '''
+
+        kind, key, payload = message
+
+        if kind == 'call':
+            asyncio.ensure_future(self._call(key, payload))
+        elif kind == 'response':
+            future = self._pending.get(key)
+
+            if future is not None and not future.done():
+                future.set_result(payload)
+
+    async def _call(self, key: int | None, operation: str) -> None:
+        '''
+        Executa uma operação e envia o resultado ao supervisor, se ele o aguardar.
+        '''
+
+        result = None
+        handler = self._handlers.get(operation)
+
+        if handler is not None:
+            try:
+                result = handler()
+
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception('Cluster operation "%s" failed', operation)
+                result = None
+
+        if key is not None:
+            self._connection.send(('reply', key, result))
+
+
+class _PendingRequest():
+
+    '''
+    Operação aguardando as respostas dos processos. Os processos que ainda não responderam têm a
+    resposta None.
+    '''
+
+    __slots__ = ('origin', 'request_id', 'expected', 'results', 'deadline')
+
+    origin: int
+    request_id: int
+    expected: set[int]
+    results: dict[int, Any]
+    deadline: float
+
+    def __init__(self, origin: int, request_id: int, expected: set[int], deadline: float) -> None:
+        self.origin = origin
+        self.request_id = request_id
+        self.expected = expected
+        self.results = dict.fromkeys(expected)
+        self.deadline = deadline
+
+
+class _Worker():
+
+    '''
+    Processo do cluster e o seu canal.
+    '''
+
+    __slots__ = ('worker_id', 'process', 'connection', 'connected')
+
+    worker_id: int
+    process: multiprocessing.process.BaseProcess
+    connection: Connection
+    connected: bool
+
+    def __init__(self, worker_id: int, process: multiprocessing.process.BaseProcess, connection: Connection) -> None:
+        self.worker_id = worker_id
+        self.process = process
+        self.connection = connection
+        self.connected = True
+
+
+class ClusterSupervisor():
+
+    '''
+    Supervisor do cluster.
+
+    Divide os shards em faixas contíguas e inicia um processo por faixa, cada um com o seu próprio
+    bot e a sua própria conexão com o banco de dados. Processos que terminam com erro são
+    reiniciados após restart_delay segundos. As operações pedidas por um processo são repassadas a
+    todos e as respostas são devolvidas a quem pediu; após REQUEST_TIMEOUT segundos, os processos
+    que não responderam são informados com None. A operação "off" encerra o cluster.
+
+    O bot_factory recebe os shards do processo e o número total de shards e deve poder ser
+    serializado com pickle (uma função definida no nível de um módulo).
+    '''
+
+    STOP_TIMEOUT = 30.0
+    REQUEST_TIMEOUT = 10.0
+
+    _bot_factory: Callable[[list[int], int], Bot]
+    _shard_count: int
+    _worker_count: int
+    _restart_delay: float
+    _context: multiprocessing.context.BaseContext
+    _workers: dict[int, _Worker]
+    _restarts: dict[int, float]
+    _pending: dict[int, _PendingRequest]
+    _counter: count
+    _stopping: bool
+    _log_pipeline: LogPipeline
+
+    def __init__(self,
+                 bot_factory: Callable[[list[int], int], Bot],
+                 shard_count: int,
+                 worker_count: int | None = None,
+                 restart_delay: float = 5.0) -> None:
+        self._bot_factory = bot_factory
+        self._shard_count = shard_count
+        self._worker_count = max(min(worker_count or multiprocessing.cpu_count(), shard_count), 1)
+        self._restart_delay = restart_delay
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = {}
+        self._restarts = {}
+        self._pending = {}
+        self._counter = count()
+        self._stopping = False
+        self._log_pipeline = LogPipeline()
+
+    def shard_ids(self, worker_id: int) -> list[int]:
+        '''
+        Retorna a faixa de shards de um processo.
+        '''
+
+        size, remainder = divmod(self._shard_count, self._worker_count)
+        start = worker_id * size + min(worker_id, remainder)
+
+        return list(range(start, start + size + (1 if worker_id < remainder else 0)))
+
+    def run(self) -> None:
+        '''
+        Inicia os processos e os supervisiona até o encerramento do cluster.
+        '''
+
+        self._log_pipeline.start()
+        self._log('Starting %s workers for %s shards', self._worker_count, self._shard_count)
+
+        try:
+            for worker_id in range(self._worker_count):
+                self._spawn(worker_id)
+
+            while self._workers or (self._restarts and not self._stopping):
+                self._poll()
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            self._join_all()
+            self._log('Cluster stopped')
+            self._log_pipeline.stop()
+
+    def stop(self) -> None:
+        '''
+        Pede o encerramento de todos os processos.
+        '''
+
+        self._stopping = True
+        self._restarts.clear()
+        self._broadcast(None, 'off')
+
+    def _poll(self) -> None:
+        '''
+        Aguarda e trata as mensagens e saídas dos processos, reiniciando os que estiverem prontos.
+        '''
+
+        timeout = None
+        deadlines = [*self._restarts.values(), *(pending.deadline for pending in self._pending.values())]
+
+        if deadlines:
+            timeout = max(min(deadlines) - monotonic(), 0.0)
+
+        waitables: dict[Any, _Worker] = {}
+
+        for worker in self._workers.values():
+            if worker.connected:
+                waitables[worker.connection] = worker
+
+            waitables[worker.process.sentinel] = worker
+
+        for ready in wait(list(waitables), timeout):
+            worker = waitables[ready]
+
+            if ready is worker.connection:
+                self._receive(worker)
+            elif worker.worker_id in self._workers:
+                self._handle_exit(worker)
+
+        now = monotonic()
+
+        for key, pending in list(self._pending.items()):
+            if pending.deadline <= now:
+                pending.expected.clear()
+                self._complete(key)
+
+        for worker_id, due in list(self._restarts.items()):
+            if due <= now:
+                del self._restarts[worker_id]
+                self._spawn(worker_id)
+
+    def _spawn(self, worker_id: int) -> None:
+        '''
+        Inicia o processo de uma faixa de shards.
+        '''
+
+        connection, child_connection = self._context.Pipe()
+        shard_ids = self.shard_ids(worker_id)
+        process = self._context.Process(target=_run_worker,
+                                        args=(self._bot_factory, worker_id, shard_ids, self._shard_count, child_connection),
+                                        name=f'ClusterWorker-{worker_id}')
+        process.start()
+        child_connection.close()
+
+        self._workers[worker_id] = _Worker(worker_id, process, connection)
+        self._log('Worker %s started with shards %s', worker_id, shard_ids)
+
+    def _receive(self, worker: _Worker) -> None:
+        '''
+        Trata uma mensagem de um processo.
+        '''
+
+        try:
+            kind, key, payload = worker.connection.recv()
+        except (EOFError, OSError):
+            # O processo fechou o canal; a saída é tratada pelo sentinel
+            worker.connected = False
+            return
+
+        if kind == 'request':
+            if payload == 'off':
+                self._log('Cluster shutdown requested by worker %s', worker.worker_id)
+                self._stopping = True
+                self._restarts.clear()
+
+            self._broadcast(None if key is None else (worker.worker_id, key), payload)
+        elif kind == 'reply':
+            pending = self._pending.get(key)
+
+            if pending is not None and worker.worker_id in pending.expected:
+                pending.results[worker.worker_id] = payload
+                pending.expected.discard(worker.worker_id)
+                self._complete(key)
+
+    def _broadcast(self, origin: tuple[int, int] | None, operation: str) -> None:
+        '''
+        Envia uma operação a todos os processos, registrando-a se a origem aguarda as respostas.
+        '''
+
+        key = None
+
+        if origin is not None:
+            key = next(self._counter)
+            self._pending[key] = _PendingRequest(origin[0], origin[1], set(self._workers), monotonic() + self.REQUEST_TIMEOUT)
+
+        for worker in list(self._workers.values()):
+            self._send(worker, ('call', key, operation))
+
+        if key is not None:
+            self._complete(key)
+
+    def _complete(self, key: int) -> None:
+        '''
+        Devolve as respostas de uma operação à origem, se todos os processos responderam.
+        '''
+
+        pending = self._pending[key]
+
+        if pending.expected:
+            return
+
+        del self._pending[key]
+        origin = self._workers.get(pending.origin)
+
+        if origin is not None:
+            self._send(origin, ('response', pending.request_id, dict(sorted(pending.results.items()))))
+
+    def _send(self, worker: _Worker, message: tuple) -> None:
+        '''
+        Envia uma mensagem a um processo, ignorando processos já encerrados.
+        '''
+
+        try:
+            worker.connection.send(message)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _handle_exit(self, worker: _Worker) -> None:
+        '''
+        Trata a saída de um processo, agendando o seu reinício se ele terminou com erro.
+        '''
+
+        del self._workers[worker.worker_id]
+        worker.process.join()
+        worker.connection.close()
+
+        for key, pending in list(self._pending.items()):
+            pending.expected.discard(worker.worker_id)
+            self._complete(key)
+
+        exitcode = worker.process.exitcode
+
+        if self._stopping or exitcode == 0:
+            self._log('Worker %s exited with code %s', worker.worker_id, exitcode)
+            return
+
+        self._log('Worker %s crashed with code %s, restarting in %.1f s',
+                  worker.worker_id,
+                  exitcode,
+                  self._restart_delay,
+                  level=logging.WARNING)
+        self._restarts[worker.worker_id] = monotonic() + self._restart_delay
+
+    def _join_all(self) -> None:
+        '''
+        Aguarda o encerramento dos processos, forçando os que não encerrarem a tempo.
+        '''
+
+        deadline = monotonic() + self.STOP_TIMEOUT
+
+        for worker in list(self._workers.values()):
+            worker.process.join(max(deadline - monotonic(), 0.0))
+
+            if worker.process.is_alive():
+                self._log('Worker %s did not stop in time, terminating', worker.worker_id, level=logging.WARNING)
+                worker.process.terminate()
+                worker.process.join()
+
+            worker.connection.close()
+
+        self._workers.clear()
+
+    def _log(self, message: str, *args: object, level: int = logging.INFO) -> None:
+        '''
+        Registra uma mensagem do supervisor.
+        '''
+
+        self._log_pipeline.log('Cluster', message, *args, level=level)
+
+
+def _run_worker(bot_factory: Callable[[list[int], int], Bot],
+                worker_id: int,
+                shard_ids: list[int],
+                shard_count: int,
+                connection: Connection) -> None:
+    '''
+    Ponto de entrada de um processo do cluster.
+    '''
+
+    bot = bot_factory(shard_ids, shard_count)
+    bot.attach_cluster(ClusterClient(connection, worker_id))
+    bot.run()
@@ -4,34 +4,566 @@
 Módulo para o banco de dados.
 '''
 
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+import asyncio
+import logging
+import re
 import sqlite3
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+if TYPE_CHECKING:
+    from discpybotframe.internals.metrics import MetricsCollector
+
+
+# Perfis de desempenho. Valores negativos de cache_size são em KiB.
+DATABASE_PROFILES: dict[str, dict[str, int | str]] = {
+    'default': {},
+    'balanced': {'journal_mode': 'WAL',
+                 'synchronous': 'NORMAL',
+                 'temp_store': 'MEMORY',
+                 'cache_size': -16000,
+                 'busy_timeout': 5000},
+    'read_heavy': {'journal_mode': 'WAL',
+                   'synchronous': 'NORMAL',
+                   'temp_store': 'MEMORY',
+                   'cache_size': -65536,
+                   'mmap_size': 268435456,
+                   'busy_timeout': 10000},
+    'write_heavy': {'journal_mode': 'WAL',
+                    'synchronous': 'NORMAL',
+                    'temp_store': 'MEMORY',
+                    'cache_size': -32000,
+                    'wal_autocheckpoint': 10000,
+                    'busy_timeout': 10000}
+}
+
+_ALLOWED_PRAGMAS = {'journal_mode',
+                    'synchronous',
+                    'temp_store',
+                    'cache_size',
+                    'mmap_size',
+                    'busy_timeout',
+                    'wal_autocheckpoint',
+                    'foreign_keys'}
+
+_PRAGMA_VALUE_PATTERN = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
+def resolve_pragmas(profile: str = 'default', overrides: dict | None = None) -> dict[str, int | str]:
+    '''
+    Combina um perfil de desempenho com configurações específicas e valida o resultado.
+    '''
+
+    if profile not in DATABASE_PROFILES:
+        raise ValueError(f'Unknown database profile "{profile}"')
+
+    pragmas = dict(DATABASE_PROFILES[profile])
+    pragmas.update(overrides or {})
+
+    for name, value in pragmas.items():
+        if name not in _ALLOWED_PRAGMAS:
+            raise ValueError(f'Unsupported pragma "{name}"')
+
+        if not _PRAGMA_VALUE_PATTERN.match(str(value)):
+            raise ValueError(f'Invalid value "{value}" for pragma "{name}"')
+
+    return pragmas
+
+
+_logger = logging.LoggerAdapter(logging.getLogger('discpybotframe.Database'), {'origin': 'Database'})
+
+
+class StatementRegistry():
+
+    '''
+    Registro de instruções SQL nomeadas e parametrizadas.
+
+    Cada instrução tem um texto fixo, o que permite que o cache de instruções preparadas de cada
+    conexão seja reaproveitado entre as chamadas.
+    '''
+
+    _statements: dict[str, str]
+
+    def __init__(self) -> None:
+        self._statements = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._statements
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def register(self, name: str, query: str) -> None:
+        '''
+        Registra uma instrução. Registrar o mesmo nome com outro texto é um erro.
+        '''
+
+        query = ' '.join(query.split())
+
+        if self._statements.get(name, query) != query:
+            raise ValueError(f'The statement "{name}" is already registered with a different query')
+
+        self._statements[name] = query
+
+    def get(self, name: str) -> str:
+        '''
+        Retorna o texto de uma instrução registrada.
+        '''
+
+        try:
+            return self._statements[name]
+        except KeyError:
+            raise KeyError(f'The statement "{name}" is not registered') from None
 
 
 class DatabaseController():
 
     '''
-    Controle do banco de dados.
+    Controle assíncrono do banco de dados.
+
+    As escritas são serializadas em uma thread dedicada, com a sua própria conexão, e as leituras
+    são feitas em um pool de threads com uma conexão por thread. Nenhuma operação bloqueia o loop
+    de eventos.
+
+    Escritas enfileiradas com queue_write são agrupadas em uma única transação, que é efetivada
+    quando o buffer atinge batch_size operações, após flush_interval segundos ou no fechamento.
+    Se a transação falhar, as escritas são repetidas uma a uma e apenas as que falharem são
+    descartadas, com registro no log. Leituras e escritas diretas aguardam a efetivação de todas as
+    escritas enfileiradas antes delas, inclusive as de uma efetivação já em andamento.
+
+    Os métodos com sufixo _named executam instruções registradas em statements pelo nome.
+
+    As pragmas recebidas são aplicadas a cada conexão quando ela é aberta. Se um coletor de
+    métricas for informado, a duração de cada operação é registrada na métrica "database".
     '''
 
-    _connection: sqlite3.Connection
-    _cursor: sqlite3.Cursor
+    _path: str
+    _shared_connection: bool
+    _writer: ThreadPoolExecutor
+    _readers: ThreadPoolExecutor
+    _local: threading.local
+    _connections: list[sqlite3.Connection]
+    _connections_lock: threading.Lock
+    _closed: bool
+    _pending: list[tuple[str, tuple]]
+    _batch_size: int
+    _flush_interval: float
+    _flush_handle: asyncio.TimerHandle | None
+    _flush_task: asyncio.Task | None
+    _flushing: asyncio.Task | None
+    _queued_count: int
+    _flushed_count: int
+    _statements: StatementRegistry
+    _pragmas: dict[str, int | str]
+    _metrics: MetricsCollector | None
+
+    def __init__(self,
+                 path: str,
+                 reader_count: int = 4,
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 pragmas: dict[str, int | str] | None = None,
+                 metrics: MetricsCollector | None = None) -> None:
+        self._path = path
+        # Bancos em memória não são compartilhados entre conexões, então tudo passa pelo escritor
+        self._shared_connection = path == ':memory:'
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='DatabaseWriter')
+        self._readers = ThreadPoolExecutor(max_workers=max(reader_count, 1), thread_name_prefix='DatabaseReader')
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        self._pending = []
+        self._batch_size = max(batch_size, 1)
+        self._flush_interval = flush_interval
+        self._flush_handle = None
+        self._flush_task = None
+        self._flushing = None
+        self._queued_count = 0
+        self._flushed_count = 0
+        self._statements = StatementRegistry()
+        self._pragmas = resolve_pragmas('default', pragmas)
+        self._metrics = metrics
+
+    @classmethod
+    def from_settings(cls, path: str, settings: dict, metrics: MetricsCollector | None = None) -> DatabaseController:
+        '''
+        Constrói o controlador a partir da seção "database" das configurações internas.
+        '''
+
+        return cls(path,
+                   reader_count=settings.get('reader_count', 4),
+                   batch_size=settings.get('batch_size', 500),
+                   flush_interval=settings.get('flush_interval', 1.0),
+                   pragmas=resolve_pragmas(settings.get('profile', 'default'), settings.get('pragmas')),
+                   metrics=metrics)
+
+    @property
+    def path(self) -> str:
+        '''
+        Getter para o caminho do banco de dados.
+        '''
 
-    def __init__(self, path: str) -> None:
-        self._connection = sqlite3.connect(path)
-        self._cursor = self._connection.cursor()
+        return self._path
 
     @property
-    def connection(self) -> sqlite3.Connection:
+    def closed(self) -> bool:
         '''
-        Getter para a conexão.
+        Getter para o estado do controlador.
         '''
 
-        return self._connection
+        return self._closed
 
     @property
-    def cursor(self) -> sqlite3.Cursor:
+    def pragmas(self) -> dict[str, int | str]:
+        '''
+        Getter para as pragmas aplicadas às conexões.
+        '''
+
+        return dict(self._pragmas)
+
+    @property
+    def statements(self) -> StatementRegistry:
+        '''
+        Getter para o registro de instruções.
+        '''
+
+        return self._statements
+
+    @property
+    def pending_count(self) -> int:
+        '''
+        Getter para o número de escritas pendentes no buffer.
+        '''
+
+        return len(self._pending)
+
+    # Métodos assíncronos
+    async def execute(self, query: str, parameters: Iterable[Any] = ()) -> int:
+        '''
+        Executa uma instrução de escrita em uma transação e retorna o número de linhas afetadas.
+        '''
+
+        await self.flush()
+        return await self._run(self._writer, self._execute, query, tuple(parameters))
+
+    async def executemany(self, query: str, parameters: Iterable[Iterable[Any]]) -> int:
+        '''
+        Executa uma instrução de escrita para cada conjunto de parâmetros em uma única transação.
+        '''
+
+        await self.flush()
+        return await self._run(self._writer, self._executemany, query, [tuple(item) for item in parameters])
+
+    async def fetchone(self, query: str, parameters: Iterable[Any] = ()) -> sqlite3.Row | None:
+        '''
+        Executa uma consulta e retorna a primeira linha.
+        '''
+
+        await self.flush()
+        return await self._run(self._read_executor(), self._fetchone, query, tuple(parameters))
+
+    async def fetchall(self, query: str, parameters: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        '''
+        Executa uma consulta e retorna todas as linhas.
+        '''
+
+        await self.flush()
+        return await self._run(self._read_executor(), self._fetchall, query, tuple(parameters))
+
+    async def queue_write(self, query: str, parameters: Iterable[Any] = ()) -> None:
+        '''
+        Adiciona uma escrita ao buffer, que será efetivada junto com as demais em uma transação.
+        '''
+
+        if self._closed:
+            raise RuntimeError('The database controller is closed')
+
+        self._pending.append((query, tuple(parameters)))
+        self._queued_count += 1
+
+        if len(self._pending) >= self._batch_size:
+            await self.flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self._flush_interval, self._on_flush_timer)
+
+    async def flush(self) -> None:
+        '''
+        Efetiva todas as escritas enfileiradas até agora, aguardando a efetivação em andamento.
+        '''
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        target = self._queued_count
+
+        while self._flushed_count < target:
+            if self._flushing is None:
+                self._flushing = asyncio.ensure_future(self._flush_pending())
+
+            await asyncio.shield(self._flushing)
+
+    async def execute_named(self, name: str, parameters: Iterable[Any] = ()) -> int:
+        '''
+        Executa uma instrução de escrita registrada.
+        '''
+
+        return await self.execute(self._statements.get(name), parameters)
+
+    async def executemany_named(self, name: str, parameters: Iterable[Iterable[Any]]) -> int:
+        '''
+        Executa uma instrução de escrita registrada para cada conjunto de parâmetros.
+        '''
+
+        return await self.executemany(self._statements.get(name), parameters)
+
+    async def fetchone_named(self, name: str, parameters: Iterable[Any] = ()) -> sqlite3.Row | None:
+        '''
+        Executa uma consulta registrada e retorna a primeira linha.
+        '''
+
+        return await self.fetchone(self._statements.get(name), parameters)
+
+    async def fetchall_named(self, name: str, parameters: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        '''
+        Executa uma consulta registrada e retorna todas as linhas.
+        '''
+
+        return await self.fetchall(self._statements.get(name), parameters)
+
+    async def queue_write_named(self, name: str, parameters: Iterable[Any] = ()) -> None:
+        '''
+        Adiciona uma escrita registrada ao buffer.
+        '''
+
+        await self.queue_write(self._statements.get(name), parameters)
+
+    async def transaction(self, function: Callable[..., Any], *args: Any) -> Any:
         '''
-        Getter para o cursor.
+        Executa uma função na conexão do escritor dentro de uma transação explícita.
+
+        A função recebe a conexão como primeiro argumento. Qualquer exceção desfaz a transação.
+        '''
+
+        await self.flush()
+        return await self._run(self._writer, self._transaction, function, args)
+
+    async def close(self) -> None:
         '''
+        Efetiva as escritas pendentes, encerra as threads e fecha todas as conexões.
+        '''
+
+        if self._closed:
+            return
+
+        await self.flush()
+
+        self._closed = True
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._shutdown)
+
+    # Métodos internos
+    async def _run(self, executor: ThreadPoolExecutor, function: Callable, *args: Any) -> Any:
+        '''
+        Executa uma função em um executor sem bloquear o loop.
+        '''
+
+        if self._closed:
+            raise RuntimeError('The database controller is closed')
+
+        loop = asyncio.get_running_loop()
+
+        if self._metrics is None:
+            return await loop.run_in_executor(executor, partial(function, *args))
+
+        with self._metrics.timer('database', function.__name__.lstrip('_')):
+            return await loop.run_in_executor(executor, partial(function, *args))
+
+    async def _flush_pending(self) -> None:
+        '''
+        Efetiva o buffer atual. Se a transação falhar, repete as escritas uma a uma.
+        '''
+
+        pending = self._pending
+        flushed_count = self._queued_count
+        self._pending = []
+
+        try:
+            try:
+                await self._run(self._writer, self._execute_batch, pending)
+            except sqlite3.Error as error:
+                _logger.warning('Batch of %s writes failed (%s), retrying them one by one', len(pending), error)
+
+                for query, parameters, failure in await self._run(self._writer, self._execute_each, pending):
+                    _logger.error('Discarded write "%s" %s: %s', query, parameters, failure)
+        except BaseException:
+            # Erros fora do SQLite (como o fechamento) devolvem as escritas ao buffer
+            self._pending[:0] = pending
+            raise
+        else:
+            self._flushed_count = max(self._flushed_count, flushed_count)
+        finally:
+            self._flushing = None
+
+    def _on_flush_timer(self) -> None:
+        '''
+        Dispara a efetivação do buffer quando o intervalo expira.
+        '''
+
+        self._flush_handle = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    @staticmethod
+    def _on_flush_done(task: asyncio.Task) -> None:
+        '''
+        Registra o erro de uma efetivação disparada pelo temporizador.
+        '''
+
+        if not task.cancelled() and task.exception() is not None:
+            _logger.error('Timed flush failed: %s', task.exception())
+
+    def _read_executor(self) -> ThreadPoolExecutor:
+        '''
+        Retorna o executor usado para as leituras.
+        '''
+
+        return self._writer if self._shared_connection else self._readers
+
+    def _get_connection(self) -> sqlite3.Connection:
+        '''
+        Retorna a conexão da thread atual, criando-a se necessário.
+        '''
+
+        connection: sqlite3.Connection | None = getattr(self._local, 'connection', None)
+
+        if connection is None:
+            # A conexão só é usada pela thread que a criou, exceto no fechamento
+            connection = sqlite3.connect(self._path,
+                                         check_same_thread=False,
+                                         cached_statements=max(128, 2 * len(self._statements)))
+            connection.row_factory = sqlite3.Row
+
+            for name, value in self._pragmas.items():
+                connection.execute(f'PRAGMA {name} = {value};')
+            self._local.connection = connection
+
+            with self._connections_lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def _execute(self, query: str, parameters: tuple) -> int:
+        '''
+        Executa uma escrita na thread do escritor.
+        '''
+
+        connection = self._get_connection()
+
+        with connection:
+            cursor = connection.execute(query, parameters)
+
+        return cursor.rowcount
+
+    def _executemany(self, query: str, parameters: list[tuple]) -> int:
+        '''
+        Executa uma escrita em lote na thread do escritor.
+        '''
+
+        connection = self._get_connection()
+
+        with connection:
+            cursor = connection.executemany(query, parameters)
+
+        return cursor.rowcount
+
+    def _execute_batch(self, operations: list[tuple[str, tuple]]) -> None:
+        '''
+        Executa as escritas do buffer em uma única transação, agrupando instruções consecutivas iguais.
+        '''
+
+        connection = self._get_connection()
+
+        with connection:
+            index = 0
+
+            while index < len(operations):
+                query = operations[index][0]
+                end = index
+
+                while end < len(operations) and operations[end][0] == query:
+                    end += 1
+
+                connection.executemany(query, [parameters for _, parameters in operations[index:end]])
+                index = end
+
+    def _execute_each(self, operations: list[tuple[str, tuple]]) -> list[tuple[str, tuple, sqlite3.Error]]:
+        '''
+        Executa as escritas do buffer uma a uma, cada uma na sua transação, e retorna as que falharam.
+        '''
+
+        connection = self._get_connection()
+        failures: list[tuple[str, tuple, sqlite3.Error]] = []
+
+        for query, parameters in operations:
+            try:
+                with connection:
+                    connection.execute(query, parameters)
+            except sqlite3.Error as error:
+                failures.append((query, parameters, error))
+
+        return failures
+
+    def _transaction(self, function: Callable[..., Any], args: tuple) -> Any:
+        '''
+        Executa uma função entre BEGIN e COMMIT na thread do escritor.
+        '''
+
+        connection = self._get_connection()
+        connection.execute('BEGIN;')
+
+        try:
+            result = function(connection, *args)
+        except BaseException:
+            connection.rollback()
+            raise
+
+        connection.commit()
+
+        return result
+
+    def _fetchone(self, query: str, parameters: tuple) -> sqlite3.Row | None:
+        '''
+        Executa uma consulta de uma linha na thread atual.
+        '''
+
+        return self._get_connection().execute(query, parameters).fetchone()
+
+    def _fetchall(self, query: str, parameters: tuple) -> list[sqlite3.Row]:
+        '''
+        Executa uma consulta de várias linhas na thread atual.
+        '''
+
+        return self._get_connection().execute(query, parameters).fetchall()
+
+    def _shutdown(self) -> None:
+        '''
+        Aguarda as operações pendentes e fecha as conexões.
+        '''
+
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
 
-        return self._cursor
+            self._connections.clear()
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para o registro de servidores personalizados.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Iterator
+
+import asyncio
+
+from collections import OrderedDict
+from time import monotonic
+
+if TYPE_CHECKING:
+    from discpybotframe.discord.guild import Guild
+
+
+class GuildRegistry():
+
+    '''
+    Registro preguiçoso de servidores.
+
+    Os servidores são materializados no primeiro acesso e mantidos em um LRU limitado a max_size
+    entradas (0 para ilimitado). Servidores ociosos por mais de idle_timeout segundos podem ser
+    descarregados com evict_idle. Antes de sair da memória, o servidor é persistido com unload, e
+    um acesso durante a persistência aguarda o seu fim antes de materializar o servidor de novo.
+    '''
+
+    _factory: Callable[[int], Awaitable[Guild]]
+    _guilds: OrderedDict[int, Guild]
+    _last_access: dict[int, float]
+    _known_ids: set[int]
+    _locks: dict[int, asyncio.Lock]
+    _evicting: dict[int, asyncio.Future]
+    _max_size: int
+    _idle_timeout: float
+
+    def __init__(self, factory: Callable[[int], Awaitable[Guild]], max_size: int = 0, idle_timeout: float = 0.0) -> None:
+        self._factory = factory
+        self._guilds = OrderedDict()
+        self._last_access = {}
+        self._known_ids = set()
+        self._locks = {}
+        self._evicting = {}
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+
+    def __len__(self) -> int:
+        return len(self._known_ids)
+
+    def __contains__(self, guild_id: object) -> bool:
+        return guild_id in self._known_ids
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._known_ids)
+
+    # Getters e Setters
+    @property
+    def lazy(self) -> bool:
+        '''
+        Getter do modo preguiçoso.
+        '''
+
+        return self._max_size > 0
+
+    @property
+    def max_size(self) -> int:
+        '''
+        Getter do tamanho máximo do LRU.
+        '''
+
+        return self._max_size
+
+    @property
+    def idle_timeout(self) -> float:
+        '''
+        Getter do tempo de ociosidade.
+        '''
+
+        return self._idle_timeout
+
+    @property
+    def loaded_count(self) -> int:
+        '''
+        Getter do número de servidores materializados.
+        '''
+
+        return len(self._guilds)
+
+    # Métodos
+    def register(self, guild_ids: Iterable[int]) -> None:
+        '''
+        Registra servidores conhecidos sem materializá-los.
+        '''
+
+        self._known_ids.update(guild_ids)
+
+    def loaded(self) -> list[Guild]:
+        '''
+        Retorna os servidores materializados.
+        '''
+
+        return list(self._guilds.values())
+
+    async def get(self, guild_id: int) -> Guild:
+        '''
+        Retorna um servidor, materializando-o se necessário.
+        '''
+
+        if guild_id not in self._known_ids:
+            raise KeyError(guild_id)
+
+        guild = self._touch(guild_id)
+
+        if guild is not None:
+            return guild
+
+        lock = self._locks.setdefault(guild_id, asyncio.Lock())
+
+        async with lock:
+            # Outro acesso pode ter materializado o servidor enquanto aguardava
+            guild = self._touch(guild_id)
+
+            if guild is None:
+                # Os dados só podem ser lidos depois de persistidos por um descarregamento em curso
+                evicting = self._evicting.get(guild_id)
+
+                if evicting is not None:
+                    await asyncio.shield(evicting)
+
+                guild = await self._factory(guild_id)
+                await self.add(guild)
+
+        self._locks.pop(guild_id, None)
+
+        return guild
+
+    async def add(self, guild: Guild) -> None:
+        '''
+        Adiciona um servidor já carregado.
+        '''
+
+        self._known_ids.add(guild.identification)
+        self._guilds[guild.identification] = guild
+        self._guilds.move_to_end(guild.identification)
+        self._last_access[guild.identification] = monotonic()
+
+        if self._max_size > 0:
+            while len(self._guilds) > self._max_size:
+                await self.evict(next(iter(self._guilds)))
+
+    async def pop(self, guild_id: int) -> Guild | None:
+        '''
+        Remove um servidor do registro e o retorna, se ele estiver materializado. Materializações e
+        descarregamentos em curso são aguardados antes.
+        '''
+
+        if guild_id not in self._known_ids:
+            return None
+
+        lock = self._locks.get(guild_id)
+
+        if lock is not None:
+            async with lock:
+                pass
+
+        evicting = self._evicting.get(guild_id)
+
+        if evicting is not None:
+            await asyncio.shield(evicting)
+
+        self._known_ids.discard(guild_id)
+        self._last_access.pop(guild_id, None)
+
+        return self._guilds.pop(guild_id, None)
+
+    async def evict(self, guild_id: int) -> None:
+        '''
+        Persiste e descarrega um servidor da memória, mantendo-o no registro.
+        '''
+
+        guild = self._guilds.pop(guild_id, None)
+        self._last_access.pop(guild_id, None)
+
+        if guild is None:
+            return
+
+        evicting = self._evicting[guild_id] = asyncio.get_running_loop().create_future()
+
+        try:
+            await guild.unload()
+        finally:
+            evicting.set_result(None)
+
+            if self._evicting.get(guild_id) is evicting:
+                del self._evicting[guild_id]
+
+    async def evict_idle(self) -> int:
+        '''
+        Descarrega os servidores ociosos e retorna quantos foram descarregados.
+        '''
+
+        if self._idle_timeout <= 0.0:
+            return 0
+
+        deadline = monotonic() - self._idle_timeout
+        idle_ids = [guild_id for guild_id, last_access in self._last_access.items() if last_access < deadline]
+
+        for guild_id in idle_ids:
+            await self.evict(guild_id)
+
+        return len(idle_ids)
+
+    async def unload_all(self) -> None:
+        '''
+        Persiste e descarrega todos os servidores materializados.
+        '''
+
+        for guild_id in list(self._guilds):
+            await self.evict(guild_id)
+
+    def _touch(self, guild_id: int) -> Guild | None:
+        '''
+        Retorna um servidor materializado e marca o acesso.
+        '''
+
+        guild = self._guilds.get(guild_id)
+
+        if guild is not None:
+            self._guilds.move_to_end(guild_id)
+            self._last_access[guild_id] = monotonic()
+
+        return guild
+
+
+class ShardedGuildRegistry():
+
+    '''
+    Registro de servidores particionado por shard.
+
+    Cada shard tem o seu próprio GuildRegistry, com o seu próprio LRU. O shard de um servidor é
+    calculado a partir do seu ID, da mesma forma que no gateway do Discord.
+    '''
+
+    _factory: Callable[[int], Awaitable[Guild]]
+    _shard_count: Callable[[], int]
+    _shards: dict[int, GuildRegistry]
+    _max_size: int
+    _idle_timeout: float
+
+    def __init__(self,
+                 factory: Callable[[int], Awaitable[Guild]],
+                 shard_count: Callable[[], int],
+                 max_size: int = 0,
+                 idle_timeout: float = 0.0) -> None:
+        self._factory = factory
+        self._shard_count = shard_count
+        self._shards = {}
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+
+    def __len__(self) -> int:
+        return sum(len(registry) for registry in self._shards.values())
+
+    def __contains__(self, guild_id: object) -> bool:
+        return isinstance(guild_id, int) and guild_id in self.shard(self.shard_id(guild_id))
+
+    def __iter__(self) -> Iterator[int]:
+        for registry in list(self._shards.values()):
+            yield from registry
+
+    # Getters e Setters
+    @property
+    def lazy(self) -> bool:
+        '''
+        Getter do modo preguiçoso.
+        '''
+
+        return self._max_size > 0
+
+    @property
+    def max_size(self) -> int:
+        '''
+        Getter do tamanho máximo do LRU de cada shard.
+        '''
+
+        return self._max_size
+
+    @property
+    def idle_timeout(self) -> float:
+        '''
+        Getter do tempo de ociosidade.
+        '''
+
+        return self._idle_timeout
+
+    @property
+    def loaded_count(self) -> int:
+        '''
+        Getter do número de servidores materializados.
+        '''
+
+        return sum(registry.loaded_count for registry in self._shards.values())
+
+    @property
+    def shards(self) -> dict[int, GuildRegistry]:
+        '''
+        Getter dos registros por shard.
+        '''
+
+        return dict(self._shards)
+
+    # Métodos
+    def shard_id(self, guild_id: int) -> int:
+        '''
+        Retorna o shard de um servidor.
+        '''
+
+        return (guild_id >> 22) % max(self._shard_count(), 1)
+
+    def shard(self, shard_id: int) -> GuildRegistry:
+        '''
+        Retorna o registro de um shard, criando-o se necessário.
+        '''
+
+        registry = self._shards.get(shard_id)
+
+        if registry is None:
+            registry = self._shards[shard_id] = GuildRegistry(self._factory, self._max_size, self._idle_timeout)
+
+        return registry
+
+    def register(self, guild_ids: Iterable[int]) -> None:
+        '''
+        Registra servidores conhecidos sem materializá-los.
+        '''
+
+        for guild_id in guild_ids:
+            self.shard(self.shard_id(guild_id)).register((guild_id,))
+
+    def loaded(self) -> list[Guild]:
+        '''
+        Retorna os servidores materializados.
+        '''
+
+        return [guild for registry in self._shards.values() for guild in registry.loaded()]
+
+    async def get(self, guild_id: int) -> Guild:
+        '''
+        Retorna um servidor, materializando-o se necessário.
+        '''
+
+        return await self.shard(self.shard_id(guild_id)).get(guild_id)
+
+    async def add(self, guild: Guild) -> None:
+        '''
+        Adiciona um servidor já carregado.
+        '''
+
+        await self.shard(self.shard_id(guild.identification)).add(guild)
+
+    async def pop(self, guild_id: int) -> Guild | None:
+        '''
+        Remove um servidor do registro e o retorna, se ele estiver materializado.
+        '''
+
+        return await self.shard(self.shard_id(guild_id)).pop(guild_id)
+
+    async def evict(self, guild_id: int) -> None:
+        '''
+        Persiste e descarrega um servidor da memória, mantendo-o no registro.
+        '''
+
+        await self.shard(self.shard_id(guild_id)).evict(guild_id)
+
+    async def evict_idle(self) -> int:
+        '''
+        Descarrega os servidores ociosos de todos os shards e retorna quantos foram descarregados.
+        '''
+
+        evicted = 0
+
+        for registry in list(self._shards.values()):
+            evicted += await registry.evict_idle()
+
+        return evicted
+
+    async def unload_all(self) -> None:
+        '''
+        Persiste e descarrega todos os servidores materializados.
+        '''
+
+        for registry in list(self._shards.values()):
+            await registry.unload_all()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para as informações de saúde do bot.
+'''
+
+from __future__ import annotations
+from typing import Callable
+
+import os
+import platform
+
+from datetime import timedelta
+from time import monotonic
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - indisponível no Windows
+    resource = None  # type: ignore
+
+
+class InfoCollector():
+
+    '''
+    Coletor de informações do bot.
+
+    Os dados estáticos do host são calculados uma única vez. Os dados dinâmicos são atualizados de
+    forma incremental pelos eventos do bot e por uma amostragem periódica (memória e atraso do loop).
+    O snapshot é reconstruído no máximo uma vez a cada ttl segundos, de forma que pode ser consultado
+    com alta frequência.
+    '''
+
+    _static: dict
+    _start_time: float
+    _guild_count: int
+    _voice_count: int
+    _memory: int
+    _loop_lag: float
+    _latency_provider: Callable[[], float]
+    _providers: list[Callable[[], dict]]
+    _snapshot: dict
+    _snapshot_time: float
+    _ttl: float
+
+    def __init__(self, name: str, version: str, latency_provider: Callable[[], float], ttl: float = 1.0) -> None:
+        self._static = {'Name': name,
+                        'Version': version,
+                        'Platform': platform.platform(),
+                        'Processor': platform.processor(),
+                        'Architecture': platform.machine(),
+                        'Python version': platform.python_version()}
+        self._start_time = monotonic()
+        self._guild_count = 0
+        self._voice_count = 0
+        self._memory = read_resident_memory()
+        self._loop_lag = 0.0
+        self._latency_provider = latency_provider
+        self._providers = []
+        self._snapshot = {}
+        self._snapshot_time = float('-inf')
+        self._ttl = ttl
+
+    # Getters
+    @property
+    def guild_count(self) -> int:
+        '''
+        Getter do número de servidores.
+        '''
+
+        return self._guild_count
+
+    @property
+    def voice_count(self) -> int:
+        '''
+        Getter do número de conexões de voz.
+        '''
+
+        return self._voice_count
+
+    @property
+    def memory(self) -> int:
+        '''
+        Getter da memória residente, em bytes, na última amostragem.
+        '''
+
+        return self._memory
+
+    @property
+    def loop_lag(self) -> float:
+        '''
+        Getter do atraso do loop, em segundos, na última amostragem.
+        '''
+
+        return self._loop_lag
+
+    # Atualizações
+    def add_provider(self, provider: Callable[[], dict]) -> None:
+        '''
+        Adiciona uma função que fornece entradas extras ao snapshot.
+        '''
+
+        self._providers.append(provider)
+
+    def set_guild_count(self, count: int) -> None:
+        '''
+        Define o número de servidores.
+        '''
+
+        self._guild_count = count
+
+    def guild_joined(self) -> None:
+        '''
+        Registra a entrada em um servidor.
+        '''
+
+        self._guild_count += 1
+
+    def guild_removed(self) -> None:
+        '''
+        Registra a saída de um servidor.
+        '''
+
+        self._guild_count = max(self._guild_count - 1, 0)
+
+    def voice_connected(self) -> None:
+        '''
+        Registra uma conexão de voz.
+        '''
+
+        self._voice_count += 1
+
+    def voice_disconnected(self) -> None:
+        '''
+        Registra uma desconexão de voz.
+        '''
+
+        self._voice_count = max(self._voice_count - 1, 0)
+
+    def record_loop_lag(self, lag: float) -> None:
+        '''
+        Registra o atraso do loop.
+        '''
+
+        self._loop_lag = lag
+
+    def sample_memory(self) -> None:
+        '''
+        Amostra a memória residente do processo.
+        '''
+
+        self._memory = read_resident_memory()
+
+    # Leitura
+    def snapshot(self) -> dict:
+        '''
+        Retorna as informações atuais, reaproveitando o último snapshot dentro do ttl.
+        '''
+
+        now = monotonic()
+
+        if now - self._snapshot_time < self._ttl:
+            return self._snapshot
+
+        snapshot = dict(self._static)
+        snapshot['Latency'] = f'{self._latency_provider() * 1000:.1f} ms'
+        snapshot['Guild count'] = self._guild_count
+        snapshot['Voice clients'] = self._voice_count
+        snapshot['Uptime'] = timedelta(seconds=int(now - self._start_time))
+        snapshot['Memory'] = f'{self._memory / (1024 * 1024):.1f} MiB'
+        snapshot['Event loop lag'] = f'{self._loop_lag * 1000:.1f} ms'
+
+        for provider in self._providers:
+            snapshot.update(provider())
+
+        self._snapshot = snapshot
+        self._snapshot_time = now
+
+        return snapshot
+
+
+def read_resident_memory() -> int:
+    '''
+    Retorna a memória residente do processo, em bytes.
+
+    Usa /proc/self/statm quando disponível e, caso contrário, o pico informado por getrusage.
+    '''
+
+    try:
+        with open('/proc/self/statm', 'r', encoding='utf-8') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if resource is not None:
+        # ru_maxrss é dado em KiB no Linux e em bytes no macOS
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if platform.system() == 'Darwin' else usage * 1024
+
+    return 0
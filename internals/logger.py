@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para o pipeline de log.
+'''
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _DeferredQueueHandler(QueueHandler):
+
+    '''
+    Handler que envia o registro para a fila sem formatá-lo.
+
+    A formatação da mensagem fica a cargo da thread de escrita.
+    '''
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class TextFormatter(logging.Formatter):
+
+    '''
+    Formatador no padrão "[data][origem]: mensagem".
+    '''
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = f'[{datetime.fromtimestamp(record.created)}][{getattr(record, "origin", record.name)}]: {record.getMessage()}'
+
+        if record.exc_info:
+            message += '\n' + self.formatException(record.exc_info)
+
+        return message
+
+
+class JsonLinesFormatter(logging.Formatter):
+
+    '''
+    Formatador que gera um objeto JSON por linha.
+    '''
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {'time': datetime.fromtimestamp(record.created).isoformat(),
+                 'level': record.levelname,
+                 'origin': getattr(record, 'origin', record.name),
+                 'message': record.getMessage()}
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class LogPipeline():
+
+    '''
+    Pipeline de log assíncrono.
+
+    As mensagens são colocadas em uma fila e escritas por uma thread em segundo plano. Mensagens
+    abaixo do nível da origem são descartadas antes de qualquer formatação, e os argumentos só são
+    interpolados na thread de escrita.
+    '''
+
+    _logger: logging.Logger
+    _queue: queue.SimpleQueue
+    _listener: QueueListener | None
+    _handler: logging.Handler
+    _origins: dict[str, logging.LoggerAdapter]
+
+    def __init__(self, name: str = 'discpybotframe') -> None:
+        self._logger = logging.getLogger(name)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._queue = queue.SimpleQueue()
+        self._listener = None
+        self._handler = logging.StreamHandler(sys.stdout)
+        self._handler.setFormatter(TextFormatter())
+        self._origins = {}
+
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+
+        self._logger.addHandler(_DeferredQueueHandler(self._queue))
+
+    def configure(self, settings: dict) -> None:
+        '''
+        Configura o pipeline a partir da seção "logging" das configurações internas.
+        '''
+
+        self._logger.setLevel(settings.get('level', 'INFO'))
+
+        for origin, level in settings.get('origins', {}).items():
+            self._logger.getChild(origin).setLevel(level)
+
+        path = settings.get('file', '')
+        handler: logging.Handler = logging.FileHandler(path, encoding='utf-8') if path else logging.StreamHandler(sys.stdout)
+        handler.setFormatter(JsonLinesFormatter() if settings.get('json', False) else TextFormatter())
+
+        running = self._listener is not None
+        self.stop()
+        self._handler.close()
+        self._handler = handler
+
+        if running:
+            self.start()
+
+    def start(self) -> None:
+        '''
+        Inicia a thread de escrita.
+        '''
+
+        if self._listener is None:
+            self._listener = QueueListener(self._queue, self._handler)
+            self._listener.start()
+
+    def stop(self) -> None:
+        '''
+        Escreve as mensagens pendentes e encerra a thread de escrita.
+        '''
+
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def is_enabled(self, origin: str, level: int) -> bool:
+        '''
+        Verifica se uma mensagem da origem e do nível seria registrada.
+        '''
+
+        return self._get_origin(origin).isEnabledFor(level)
+
+    def log(self, origin: str, message: str, *args: object, level: int = logging.INFO) -> None:
+        '''
+        Registra uma mensagem. Os argumentos são interpolados com % apenas se ela for escrita.
+        '''
+
+        self._get_origin(origin).log(level, message, *args)
+
+    def _get_origin(self, origin: str) -> logging.LoggerAdapter:
+        '''
+        Retorna o logger da origem, criando-o se necessário.
+        '''
+
+        adapter = self._origins.get(origin)
+
+        if adapter is None:
+            adapter = logging.LoggerAdapter(self._logger.getChild(origin), {'origin': origin})
+            self._origins[origin] = adapter
+
+        return adapter
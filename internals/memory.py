@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para os perfis de memória do bot.
+'''
+
+from __future__ import annotations
+from typing import Any
+
+import discord
+
+
+# Perfis de memória. Intents ausentes mantêm o valor informado ao bot. Um member_cache None segue as
+# intents e um chunk_guilds_at_startup None segue a intent de membros, como no discord.py.
+MEMORY_PROFILES: dict[str, dict[str, Any]] = {
+    'default': {},
+    'balanced': {'intents': {'presences': False,
+                             'typing': False},
+                 'member_cache': ['voice'],
+                 'max_messages': 100,
+                 'chunk_guilds_at_startup': False},
+    'minimal': {'intents': {'presences': False,
+                            'members': False,
+                            'typing': False,
+                            'invites': False,
+                            'integrations': False,
+                            'webhooks': False},
+                'member_cache': ['voice'],
+                'max_messages': None,
+                'chunk_guilds_at_startup': False}
+}
+
+_ALLOWED_OPTIONS = {'intents', 'member_cache', 'max_messages', 'chunk_guilds_at_startup'}
+
+
+def resolve_memory_options(intents: discord.Intents,
+                           profile: str = 'default',
+                           overrides: dict | None = None) -> dict[str, Any]:
+    '''
+    Combina um perfil de memória com configurações específicas e retorna os argumentos de cache do
+    discord.py: intents, member_cache_flags, max_messages e chunk_guilds_at_startup.
+    '''
+
+    if profile not in MEMORY_PROFILES:
+        raise ValueError(f'Unknown memory profile "{profile}"')
+
+    options = dict(MEMORY_PROFILES[profile])
+    overrides = dict(overrides or {})
+
+    # As intents informadas são combinadas com as do perfil, em vez de substituí-las
+    if 'intents' in overrides:
+        overrides['intents'] = {**options.get('intents', {}), **overrides['intents']}
+
+    options.update(overrides)
+
+    for name in options:
+        if name not in _ALLOWED_OPTIONS:
+            raise ValueError(f'Unsupported memory option "{name}"')
+
+    resolved_intents = discord.Intents(**dict(intents))
+
+    for name, enabled in options.get('intents', {}).items():
+        if name not in discord.Intents.VALID_FLAGS:
+            raise ValueError(f'Unknown intent "{name}"')
+
+        setattr(resolved_intents, name, enabled)
+
+    member_cache = options.get('member_cache')
+
+    if member_cache is None:
+        member_cache_flags = discord.MemberCacheFlags.from_intents(resolved_intents)
+    else:
+        member_cache_flags = discord.MemberCacheFlags.none()
+
+        for name in member_cache:
+            if name not in discord.MemberCacheFlags.VALID_FLAGS:
+                raise ValueError(f'Unknown member cache flag "{name}"')
+
+            setattr(member_cache_flags, name, True)
+
+        # O discord.py recusa caches que dependem de intents desativadas
+        member_cache_flags.voice = member_cache_flags.voice and resolved_intents.voice_states
+        member_cache_flags.joined = member_cache_flags.joined and resolved_intents.members
+
+    chunk_guilds_at_startup = options.get('chunk_guilds_at_startup')
+
+    return {'intents': resolved_intents,
+            'member_cache_flags': member_cache_flags,
+            'max_messages': options.get('max_messages', 1000),
+            'chunk_guilds_at_startup': resolved_intents.members if chunk_guilds_at_startup is None else chunk_guilds_at_startup}
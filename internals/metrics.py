@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para as métricas de latência e vazão.
+'''
+
+from __future__ import annotations
+from typing import Iterator
+
+import json
+import logging
+import os
+
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class RollingHistogram():
+
+    '''
+    Histograma das últimas amostras, em segundos.
+    '''
+
+    _samples: deque[float]
+    _count: int
+    _total: float
+
+    def __init__(self, window: int = 1024) -> None:
+        self._samples = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+
+    @property
+    def count(self) -> int:
+        '''
+        Getter do número total de amostras.
+        '''
+
+        return self._count
+
+    def observe(self, value: float) -> None:
+        '''
+        Registra uma amostra.
+        '''
+
+        self._samples.append(value)
+        self._count += 1
+        self._total += value
+
+    def summary(self) -> dict[str, float]:
+        '''
+        Retorna a contagem, a soma, a média e os percentis 50, 95 e 99 da janela.
+        '''
+
+        samples = sorted(self._samples)
+        summary = {'count': self._count, 'sum': self._total, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+
+        if samples:
+            summary['mean'] = sum(samples) / len(samples)
+
+            for name, quantile in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+                summary[name] = samples[min(int(quantile * len(samples)), len(samples) - 1)]
+
+        return summary
+
+
+class MetricsCollector():
+
+    '''
+    Coletor de métricas.
+
+    Mantém histogramas de latência e contadores por métrica e rótulo, por exemplo, a métrica
+    "command" com o rótulo "info". Os dados podem ser exportados em JSON ou no formato de texto do
+    Prometheus.
+    '''
+
+    _window: int
+    _histograms: dict[str, dict[str, RollingHistogram]]
+    _counters: dict[str, dict[str, int]]
+
+    def __init__(self, window: int = 1024) -> None:
+        self._window = window
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, metric: str, label: str, seconds: float) -> None:
+        '''
+        Registra uma duração.
+        '''
+
+        histograms = self._histograms.setdefault(metric, {})
+        histogram = histograms.get(label)
+
+        if histogram is None:
+            histogram = histograms[label] = RollingHistogram(self._window)
+
+        histogram.observe(seconds)
+
+    def increment(self, counter: str, label: str = '', amount: int = 1) -> None:
+        '''
+        Incrementa um contador.
+        '''
+
+        counters = self._counters.setdefault(counter, {})
+        counters[label] = counters.get(label, 0) + amount
+
+    @contextmanager
+    def timer(self, metric: str, label: str) -> Iterator[None]:
+        '''
+        Mede a duração do bloco, inclusive se ele lançar uma exceção.
+        '''
+
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(metric, label, perf_counter() - start)
+
+    def get_summary(self, metric: str, label: str) -> dict[str, float] | None:
+        '''
+        Retorna o resumo de um histograma, se ele existir.
+        '''
+
+        histogram = self._histograms.get(metric, {}).get(label)
+
+        return histogram.summary() if histogram is not None else None
+
+    def get_counter(self, counter: str, label: str = '') -> int:
+        '''
+        Retorna o valor de um contador.
+        '''
+
+        return self._counters.get(counter, {}).get(label, 0)
+
+    def get_counter_total(self, counter: str) -> int:
+        '''
+        Retorna a soma de um contador em todos os rótulos.
+        '''
+
+        return sum(self._counters.get(counter, {}).values())
+
+    def snapshot(self) -> dict:
+        '''
+        Retorna todas as métricas em um dicionário.
+        '''
+
+        return {'histograms': {metric: {label: histogram.summary() for label, histogram in histograms.items()}
+                               for metric, histograms in self._histograms.items()},
+                'counters': {counter: dict(values) for counter, values in self._counters.items()}}
+
+    def to_json(self) -> str:
+        '''
+        Exporta as métricas em JSON.
+        '''
+
+        return json.dumps(self.snapshot(), ensure_ascii=False)
+
+    def to_prometheus(self, prefix: str = 'discpybotframe') -> str:
+        '''
+        Exporta as métricas no formato de texto do Prometheus.
+        '''
+
+        lines = []
+
+        for metric, histograms in self._histograms.items():
+            name = f'{prefix}_{metric}_seconds'
+            lines.append(f'# TYPE {name} summary')
+
+            for label, histogram in histograms.items():
+                summary = histogram.summary()
+                escaped = _escape_label(label)
+
+                for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                    lines.append(f'{name}{{label="{escaped}",quantile="{quantile}"}} {summary[key]}')
+
+                lines.append(f'{name}_sum{{label="{escaped}"}} {summary["sum"]}')
+                lines.append(f'{name}_count{{label="{escaped}"}} {summary["count"]}')
+
+        for counter, values in self._counters.items():
+            name = f'{prefix}_{counter}_total'
+            lines.append(f'# TYPE {name} counter')
+
+            for label, value in values.items():
+                lines.append(f'{name}{{label="{_escape_label(label)}"}} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, format_: str = 'prometheus') -> str:
+        '''
+        Exporta as métricas no formato "prometheus" ou "json".
+        '''
+
+        return self.to_prometheus() if format_ == 'prometheus' else self.to_json()
+
+    @staticmethod
+    def dump(path: str, content: str) -> None:
+        '''
+        Escreve métricas exportadas em um arquivo de forma atômica. Bloqueante, deve rodar em um executor.
+        '''
+
+        temporary_path = f'{path}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(content)
+
+        os.replace(temporary_path, path)
+
+
+class RateLimitCounter(logging.Handler):
+
+    '''
+    Handler que conta os avisos de rate limit emitidos pelo cliente HTTP do discord.py.
+    '''
+
+    _metrics: MetricsCollector
+
+    def __init__(self, metrics: MetricsCollector) -> None:
+        super().__init__(logging.WARNING)
+        self._metrics = metrics
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if 'rate limit' in str(record.msg):
+            self._metrics.increment('rate_limit_hits', 'global' if 'Global' in str(record.msg) else 'route')
+
+
+def _escape_label(label: str) -> str:
+    '''
+    Escapa um valor de rótulo do Prometheus.
+    '''
+
+    return label.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
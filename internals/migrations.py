@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para as migrações do esquema do banco de dados.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+import sqlite3
+
+if TYPE_CHECKING:
+    from discpybotframe.internals.database import DatabaseController
+
+
+class Index():
+
+    '''
+    Declaração de um índice.
+    '''
+
+    _name: str
+    _table: str
+    _columns: tuple[str, ...]
+    _unique: bool
+
+    def __init__(self, name: str, table: str, columns: tuple[str, ...], unique: bool = False) -> None:
+        self._name = name
+        self._table = table
+        self._columns = columns
+        self._unique = unique
+
+    @property
+    def name(self) -> str:
+        '''
+        Getter do nome.
+        '''
+
+        return self._name
+
+    def to_sql(self) -> str:
+        '''
+        Retorna a instrução de criação do índice.
+        '''
+
+        unique = 'UNIQUE ' if self._unique else ''
+
+        return f'CREATE {unique}INDEX IF NOT EXISTS {self._name} ON {self._table} ({", ".join(self._columns)});'
+
+
+class Migration():
+
+    '''
+    Migração versionada.
+
+    As versões são contadas separadamente para cada namespace, de forma que o framework e o bot
+    possam evoluir os seus esquemas de forma independente.
+    '''
+
+    _namespace: str
+    _version: int
+    _statements: tuple[str, ...]
+    _indexes: tuple[Index, ...]
+
+    def __init__(self,
+                 namespace: str,
+                 version: int,
+                 statements: tuple[str, ...] = (),
+                 indexes: tuple[Index, ...] = ()) -> None:
+
+        if version < 1:
+            raise ValueError('Migration versions start at 1')
+
+        self._namespace = namespace
+        self._version = version
+        self._statements = statements
+        self._indexes = indexes
+
+    @property
+    def namespace(self) -> str:
+        '''
+        Getter do namespace.
+        '''
+
+        return self._namespace
+
+    @property
+    def version(self) -> int:
+        '''
+        Getter da versão.
+        '''
+
+        return self._version
+
+    def to_sql(self) -> list[str]:
+        '''
+        Retorna as instruções da migração, seguidas dos índices.
+        '''
+
+        return list(self._statements) + [index.to_sql() for index in self._indexes]
+
+
+class MigrationEngine():
+
+    '''
+    Aplica as migrações pendentes em uma única transação.
+
+    A versão aplicada de cada namespace é guardada na tabela SchemaVersion. Se todas as versões
+    aplicadas já correspondem às migrações registradas, a inicialização não executa nada além de
+    uma leitura dessa tabela.
+    '''
+
+    _migrations: dict[str, dict[int, Migration]]
+
+    def __init__(self) -> None:
+        self._migrations = {}
+
+    def register(self, migration: Migration) -> None:
+        '''
+        Registra uma migração.
+        '''
+
+        namespace = self._migrations.setdefault(migration.namespace, {})
+
+        if migration.version in namespace:
+            raise ValueError(f'Migration {migration.version} of "{migration.namespace}" is already registered')
+
+        namespace[migration.version] = migration
+
+    @property
+    def target_versions(self) -> dict[str, int]:
+        '''
+        Getter da versão esperada de cada namespace.
+        '''
+
+        return {name: max(namespace) for name, namespace in self._migrations.items() if namespace}
+
+    async def migrate(self, controller: DatabaseController) -> int:
+        '''
+        Aplica as migrações pendentes e retorna quantas foram aplicadas.
+        '''
+
+        try:
+            applied = dict(await controller.fetchall('SELECT Namespace, Version FROM SchemaVersion;'))
+        except sqlite3.OperationalError:
+            # A tabela ainda não existe
+            applied = {}
+
+        if all(applied.get(name, 0) >= version for name, version in self.target_versions.items()):
+            return 0
+
+        return await controller.transaction(self._apply)
+
+    def _apply(self, connection: sqlite3.Connection) -> int:
+        '''
+        Aplica as migrações pendentes na conexão do escritor.
+        '''
+
+        connection.execute('''
+                              CREATE TABLE IF NOT EXISTS SchemaVersion (
+                                  Namespace TEXT PRIMARY KEY,
+                                  Version INTEGER NOT NULL
+                              );
+                           ''')
+
+        applied = dict(connection.execute('SELECT Namespace, Version FROM SchemaVersion;').fetchall())
+        count = 0
+
+        for name, namespace in self._migrations.items():
+            current_version = applied.get(name, 0)
+
+            for version in sorted(namespace):
+                if version <= current_version:
+                    continue
+
+                for statement in namespace[version].to_sql():
+                    connection.execute(statement)
+
+                current_version = version
+                count += 1
+
+            connection.execute('INSERT OR REPLACE INTO SchemaVersion (Namespace, Version) VALUES (?, ?);',
+                               (name, current_version))
+
+        return count
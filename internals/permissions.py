@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para as permissões dos usuários.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+import asyncio
+
+from collections import OrderedDict
+from enum import IntEnum, IntFlag
+from itertools import count
+
+import discord
+
+from discpybotframe.internals.migrations import Migration
+
+if TYPE_CHECKING:
+    from discpybotframe.internals.database import DatabaseController, StatementRegistry
+    from discpybotframe.internals.migrations import MigrationEngine
+
+
+class Permission(IntFlag):
+
+    '''
+    Bits de permissão. GUILD_ADMIN concede todas as permissões de servidor e BOT_ADMIN, todas.
+    '''
+
+    NONE = 0
+    COMMANDS = 1 << 0
+    MODERATION = 1 << 1
+    CONFIGURATION = 1 << 2
+    AUDIO = 1 << 3
+    GUILD_ADMIN = 1 << 4
+    BOT_ADMIN = 1 << 5
+
+    GUILD_ALL = COMMANDS | MODERATION | CONFIGURATION | AUDIO | GUILD_ADMIN
+    ALL = GUILD_ALL | BOT_ADMIN
+
+
+class GrantTarget(IntEnum):
+
+    '''
+    Tipos de alvo de uma concessão.
+    '''
+
+    USER = 0
+    ROLE = 1
+
+
+class _GuildGrants():
+
+    '''
+    Concessões de um servidor, por usuário e por cargo. A geração identifica a versão das
+    concessões nas chaves do cache de permissões calculadas.
+    '''
+
+    __slots__ = ('users', 'roles', 'generation')
+
+    users: dict[int, int]
+    roles: dict[int, int]
+    generation: int
+
+    def __init__(self, generation: int) -> None:
+        self.users = {}
+        self.roles = {}
+        self.generation = generation
+
+    def get_target(self, target: GrantTarget) -> dict[int, int]:
+        '''
+        Retorna as concessões de um tipo de alvo.
+        '''
+
+        return self.users if target == GrantTarget.USER else self.roles
+
+
+class PermissionResolver():
+
+    '''
+    Resolvedor de permissões.
+
+    Os administradores globais ficam em um conjunto. As concessões de cada servidor são lidas do
+    banco no primeiro acesso e mantidas em memória até o servidor ser descarregado. As permissões
+    são calculadas a partir dos cargos do membro recebidos com a mensagem, e as permissões de cada
+    combinação de cargos ficam em um cache LRU de até max_resolved entradas. Mudanças nas
+    concessões de um servidor avançam a sua geração, o que torna as entradas antigas inalcançáveis.
+    '''
+
+    _global_admins: frozenset[int]
+    _database_controller: DatabaseController | None
+    _grants: dict[int, _GuildGrants]
+    _pending: dict[int, asyncio.Future]
+    _generations: count
+    _resolved: OrderedDict[tuple[int, int, bool, frozenset[int]], int]
+    _max_resolved: int
+
+    def __init__(self,
+                 global_admins: Iterable[int],
+                 database_controller: DatabaseController | None = None,
+                 max_resolved: int = 4096) -> None:
+        self._global_admins = frozenset(global_admins)
+        self._database_controller = database_controller
+        self._grants = {}
+        self._pending = {}
+        self._generations = count()
+        self._resolved = OrderedDict()
+        self._max_resolved = max_resolved
+
+    # Getters
+    @property
+    def global_admins(self) -> frozenset[int]:
+        '''
+        Getter dos administradores globais.
+        '''
+
+        return self._global_admins
+
+    # Migrações e instruções
+    @staticmethod
+    def register_migrations(migrations: MigrationEngine) -> None:
+        '''
+        Registra as migrações da tabela de concessões.
+        '''
+
+        migrations.register(Migration('discpybotframe', 2, ('''
+                                                                CREATE TABLE IF NOT EXISTS PermissionGrant (
+                                                                    GuildID INTEGER NOT NULL,
+                                                                    TargetType INTEGER NOT NULL,
+                                                                    TargetID INTEGER NOT NULL,
+                                                                    Permissions INTEGER NOT NULL,
+                                                                    PRIMARY KEY (GuildID, TargetType, TargetID)
+                                                                ) WITHOUT ROWID;
+                                                             ''',)))
+
+    @staticmethod
+    def register_statements(statements: StatementRegistry) -> None:
+        '''
+        Registra as instruções da tabela de concessões.
+        '''
+
+        statements.register('permission_select_guild', '''
+                                                            SELECT TargetType, TargetID, Permissions FROM PermissionGrant
+                                                            WHERE GuildID = ?;
+                                                        ''')
+
+        statements.register('permission_upsert', '''
+                                                      INSERT INTO PermissionGrant (GuildID, TargetType, TargetID, Permissions)
+                                                      VALUES (?, ?, ?, ?)
+                                                      ON CONFLICT (GuildID, TargetType, TargetID)
+                                                      DO UPDATE SET Permissions = excluded.Permissions;
+                                                  ''')
+
+        statements.register('permission_delete', '''
+                                                      DELETE FROM PermissionGrant
+                                                      WHERE GuildID = ? AND TargetType = ? AND TargetID = ?;
+                                                  ''')
+
+        statements.register('permission_delete_guild', '''
+                                                            DELETE FROM PermissionGrant
+                                                            WHERE GuildID = ?;
+                                                        ''')
+
+    # Verificações
+    def is_global_admin(self, user_id: int) -> bool:
+        '''
+        Verifica se o usuário é um administrador global.
+        '''
+
+        return user_id in self._global_admins
+
+    async def resolve(self, member: discord.abc.User, guild_id: int | None = None) -> Permission:
+        '''
+        Retorna as permissões efetivas de um usuário em um servidor.
+        '''
+
+        if member.id in self._global_admins:
+            return Permission.ALL
+
+        if guild_id is None:
+            guild = getattr(member, 'guild', None)
+
+            if guild is None:
+                return Permission.NONE
+
+            guild_id = guild.id
+
+        grants = await self._load_guild(guild_id)
+        roles = getattr(member, 'roles', ())
+        member_permissions = getattr(member, 'guild_permissions', None)
+        administrator = member_permissions is not None and member_permissions.administrator
+        key = (guild_id, grants.generation, administrator, frozenset(role.id for role in roles))
+
+        value = self._resolved.get(key)
+
+        if value is None:
+            value = Permission.GUILD_ADMIN if administrator else 0
+
+            for role in roles:
+                value |= grants.roles.get(role.id, 0)
+
+            self._resolved[key] = value
+
+            if len(self._resolved) > self._max_resolved:
+                self._resolved.popitem(last=False)
+        else:
+            self._resolved.move_to_end(key)
+
+        permissions = Permission(value | grants.users.get(member.id, 0))
+
+        if permissions & Permission.GUILD_ADMIN:
+            permissions |= Permission.GUILD_ALL
+
+        return permissions
+
+    async def has(self, member: discord.abc.User, permission: Permission, guild_id: int | None = None) -> bool:
+        '''
+        Verifica se um usuário tem todas as permissões informadas.
+        '''
+
+        return (await self.resolve(member, guild_id)) & permission == permission
+
+    # Concessões
+    async def grant(self, guild_id: int, target: GrantTarget, target_id: int, permission: Permission) -> None:
+        '''
+        Define as permissões concedidas a um usuário ou cargo em um servidor.
+        '''
+
+        grants = await self._load_guild(guild_id)
+
+        if permission == Permission.NONE:
+            grants.get_target(target).pop(target_id, None)
+        else:
+            grants.get_target(target)[target_id] = int(permission)
+
+        self.invalidate_guild(guild_id)
+
+        if self._database_controller is not None:
+            if permission == Permission.NONE:
+                await self._database_controller.queue_write_named('permission_delete', (guild_id, int(target), target_id))
+            else:
+                await self._database_controller.queue_write_named('permission_upsert',
+                                                                  (guild_id, int(target), target_id, int(permission)))
+
+    async def revoke(self, guild_id: int, target: GrantTarget, target_id: int) -> None:
+        '''
+        Remove as permissões concedidas a um usuário ou cargo em um servidor.
+        '''
+
+        await self.grant(guild_id, target, target_id, Permission.NONE)
+
+    async def forget_guild(self, guild_id: int) -> None:
+        '''
+        Remove todas as concessões de um servidor.
+        '''
+
+        self._grants.pop(guild_id, None)
+        self.invalidate_guild(guild_id)
+
+        if self._database_controller is not None:
+            await self._database_controller.queue_write_named('permission_delete_guild', (guild_id,))
+
+    # Cache
+    def invalidate_guild(self, guild_id: int) -> None:
+        '''
+        Descarta as permissões calculadas de todos os membros de um servidor.
+        '''
+
+        grants = self._grants.get(guild_id)
+
+        if grants is not None:
+            grants.generation = next(self._generations)
+
+    def unload_guild(self, guild_id: int) -> None:
+        '''
+        Descarta da memória as concessões de um servidor. As permissões calculadas deixam o cache
+        pelo LRU.
+        '''
+
+        self._grants.pop(guild_id, None)
+
+    async def _load_guild(self, guild_id: int) -> _GuildGrants:
+        '''
+        Retorna as concessões de um servidor, lendo-as do banco no primeiro acesso.
+        '''
+
+        grants = self._grants.get(guild_id)
+
+        if grants is not None:
+            return grants
+
+        if self._database_controller is None:
+            grants = self._grants[guild_id] = _GuildGrants(next(self._generations))
+            return grants
+
+        # Acessos simultâneos ao mesmo servidor compartilham a mesma leitura
+        pending = self._pending.get(guild_id)
+
+        if pending is None:
+            pending = self._pending[guild_id] = asyncio.ensure_future(self._read_guild(guild_id))
+
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            if pending.done() and self._pending.get(guild_id) is pending:
+                del self._pending[guild_id]
+
+    async def _read_guild(self, guild_id: int) -> _GuildGrants:
+        '''
+        Lê as concessões de um servidor do banco.
+        '''
+
+        assert self._database_controller is not None
+
+        grants = _GuildGrants(next(self._generations))
+
+        for row in await self._database_controller.fetchall_named('permission_select_guild', (guild_id,)):
+            grants.get_target(GrantTarget(row['TargetType']))[row['TargetID']] = row['Permissions']
+
+        return self._grants.setdefault(guild_id, grants)
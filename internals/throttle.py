@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para a limitação de comandos.
+'''
+
+from __future__ import annotations
+from typing import Callable, TypeVar
+
+from enum import Enum
+from time import monotonic
+
+from discord.ext import commands
+
+
+_T = TypeVar('_T')
+
+
+class ThrottleScope(Enum):
+
+    '''
+    Enumerador para a chave dos baldes de um comando.
+    '''
+
+    USER = 0
+    GUILD = 1
+    GLOBAL = 2
+
+
+class ThrottleRule():
+
+    '''
+    Regra de limitação: rate usos a cada per segundos, com rajadas de até burst usos.
+    '''
+
+    __slots__ = ('scope', 'rate', 'burst')
+
+    scope: ThrottleScope
+    rate: float
+    burst: float
+
+    def __init__(self, scope: ThrottleScope, rate: float, per: float, burst: int | None = None) -> None:
+        if rate <= 0.0 or per <= 0.0:
+            raise ValueError('The throttle rate and period must be positive')
+
+        self.scope = scope
+        self.rate = rate / per
+        self.burst = float(burst if burst is not None else max(int(rate), 1))
+
+
+class ExpiringBucketMap():
+
+    '''
+    Mapa de baldes de fichas que expiram.
+
+    Cada balde ocupa uma lista com as fichas, a última atualização e o tempo de recarga completa.
+    Um balde que ficaria cheio de novo é equivalente a um balde ausente, então ele é descartado nas
+    varreduras periódicas, de forma que o mapa só guarda os usuários ativos.
+    '''
+
+    _buckets: dict[tuple, list[float]]
+    _sweep_interval: float
+    _next_sweep: float
+
+    def __init__(self, sweep_interval: float = 60.0) -> None:
+        self._buckets = {}
+        self._sweep_interval = sweep_interval
+        self._next_sweep = monotonic() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: tuple, rate: float, capacity: float, now: float) -> bool:
+        '''
+        Consome uma ficha do balde da chave. Retorna False se o balde estiver vazio.
+        '''
+
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            # O tempo de recarga completa é guardado para a varredura
+            self._buckets[key] = [capacity - 1.0, now, capacity / rate]
+            return True
+
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+        if tokens < 1.0:
+            bucket[0] = tokens
+            return False
+
+        bucket[0] = tokens - 1.0
+        return True
+
+    def refund(self, key: tuple) -> None:
+        '''
+        Devolve uma ficha ao balde da chave.
+        '''
+
+        bucket = self._buckets.get(key)
+
+        if bucket is not None:
+            bucket[0] += 1.0
+
+    def sweep(self, now: float) -> int:
+        '''
+        Descarta os baldes que já estariam cheios e retorna quantos foram descartados.
+        '''
+
+        expired = [key for key, bucket in self._buckets.items() if now - bucket[1] >= bucket[2]]
+
+        for key in expired:
+            del self._buckets[key]
+
+        self._next_sweep = now + self._sweep_interval
+
+        return len(expired)
+
+
+class Throttler():
+
+    '''
+    Limitador de comandos.
+
+    Aplica as regras declaradas com throttle e o limite de invocações simultâneas de cada comando.
+    Invocações bloqueadas não consomem fichas das demais regras.
+    '''
+
+    _buckets: ExpiringBucketMap
+    _active: dict[str, int]
+
+    def __init__(self, sweep_interval: float = 60.0) -> None:
+        self._buckets = ExpiringBucketMap(sweep_interval)
+        self._active = {}
+
+    @property
+    def bucket_count(self) -> int:
+        '''
+        Getter do número de baldes ativos.
+        '''
+
+        return len(self._buckets)
+
+    def acquire(self, ctx: commands.Context) -> bool:
+        '''
+        Verifica as regras do comando e, se permitido, registra a invocação.
+        '''
+
+        command = ctx.command
+
+        if command is None:
+            return True
+
+        rules: tuple[ThrottleRule, ...] = getattr(command.callback, '__throttle_rules__', ())
+        max_concurrency: int = getattr(command.callback, '__throttle_max_concurrency__', 0)
+
+        if not rules and max_concurrency <= 0:
+            return True
+
+        name = command.qualified_name
+        active = self._active.get(name, 0)
+
+        if 0 < max_concurrency <= active:
+            return False
+
+        now = monotonic()
+        consumed: list[tuple] = []
+
+        for rule in rules:
+            key = self._key(rule.scope, name, ctx)
+
+            if not self._buckets.consume(key, rule.rate, rule.burst, now):
+                for consumed_key in consumed:
+                    self._buckets.refund(consumed_key)
+
+                return False
+
+            consumed.append(key)
+
+        self._active[name] = active + 1
+
+        return True
+
+    def release(self, ctx: commands.Context) -> None:
+        '''
+        Registra o fim de uma invocação permitida por acquire.
+        '''
+
+        if ctx.command is None:
+            return
+
+        name = ctx.command.qualified_name
+        active = self._active.get(name, 0) - 1
+
+        if active > 0:
+            self._active[name] = active
+        else:
+            self._active.pop(name, None)
+
+    @staticmethod
+    def _key(scope: ThrottleScope, name: str, ctx: commands.Context) -> tuple:
+        '''
+        Retorna a chave do balde de uma regra.
+        '''
+
+        if scope == ThrottleScope.USER:
+            return (name, 0, ctx.author.id)
+
+        if scope == ThrottleScope.GUILD:
+            # Em mensagens diretas, o usuário faz o papel do servidor
+            return (name, 1, ctx.guild.id if ctx.guild is not None else ctx.author.id)
+
+        return (name, 2)
+
+
+def throttle(rate: float,
+             per: float = 1.0,
+             scope: ThrottleScope = ThrottleScope.USER,
+             burst: int | None = None,
+             max_concurrency: int = 0) -> Callable[[_T], _T]:
+    '''
+    Decorador que limita um comando a rate usos a cada per segundos por escopo e, opcionalmente, a
+    max_concurrency invocações simultâneas. Pode ser empilhado para combinar escopos. Invocações
+    limitadas são descartadas sem resposta.
+    '''
+
+    rule = ThrottleRule(scope, rate, per, burst)
+
+    def decorator(func: _T) -> _T:
+        callback = func.callback if isinstance(func, commands.Command) else func
+        callback.__throttle_rules__ = getattr(callback, '__throttle_rules__', ()) + (rule,)  # type: ignore
+
+        if max_concurrency > 0:
+            callback.__throttle_max_concurrency__ = max_concurrency  # type: ignore
+
+        return func
+
+    return decorator
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para a detecção de bloqueios do loop de eventos.
+'''
+
+from __future__ import annotations
+from typing import Callable
+
+import sys
+import threading
+import traceback
+
+from time import monotonic
+
+
+class LoopWatchdog():
+
+    '''
+    Vigia do loop de eventos.
+
+    O loop registra batimentos periódicos por beat. Uma thread em segundo plano compara o último
+    batimento com o relógio e, quando o atraso passa do limite, captura a pilha da thread do loop,
+    que aponta para o código que o está bloqueando. No batimento seguinte, o atraso total e a pilha
+    capturada são entregues ao reporter, já na thread do loop.
+    '''
+
+    _interval: float
+    _threshold: float
+    _reporter: Callable[[float, list[str]], None]
+    _loop_thread_id: int | None
+    _last_beat: float
+    _lag: float
+    _stack: list[str] | None
+    _lock: threading.Lock
+    _stop: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, interval: float, threshold: float, reporter: Callable[[float, list[str]], None]) -> None:
+        self._interval = interval
+        self._threshold = threshold
+        self._reporter = reporter
+        self._loop_thread_id = None
+        self._last_beat = monotonic()
+        self._lag = 0.0
+        self._stack = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def interval(self) -> float:
+        '''
+        Getter do intervalo entre os batimentos.
+        '''
+
+        return self._interval
+
+    @property
+    def lag(self) -> float:
+        '''
+        Getter do atraso, em segundos, medido no último batimento.
+        '''
+
+        return self._lag
+
+    def start(self) -> None:
+        '''
+        Inicia a thread de vigia. Deve ser chamado na thread do loop.
+        '''
+
+        if self._thread is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name='LoopWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        '''
+        Encerra a thread de vigia.
+        '''
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def beat(self) -> float:
+        '''
+        Registra um batimento e retorna o atraso em relação ao intervalo esperado.
+        '''
+
+        now = monotonic()
+
+        with self._lock:
+            self._lag = max(now - self._last_beat - self._interval, 0.0)
+            self._last_beat = now
+            stack = self._stack
+            self._stack = None
+
+        if self._lag >= self._threshold:
+            self._reporter(self._lag, stack if stack is not None else [])
+
+        return self._lag
+
+    def _watch(self) -> None:
+        '''
+        Captura a pilha da thread do loop quando ele passa do limite sem batimentos.
+        '''
+
+        while not self._stop.wait(self._threshold / 2):
+            with self._lock:
+                stalled = monotonic() - self._last_beat - self._interval >= self._threshold
+
+                # Apenas a primeira captura de cada bloqueio é mantida
+                if not stalled or self._stack is not None:
+                    continue
+
+                last_beat = self._last_beat
+
+            frame = sys._current_frames().get(self._loop_thread_id)  # pylint: disable=protected-access
+
+            if frame is None:
+                continue
+
+            stack = traceback.format_stack(frame)
+            del frame
+
+            # Descarta a captura se o loop voltou a bater enquanto ela era feita
+            with self._lock:
+                if self._stack is None and self._last_beat == last_beat:
+                    self._stack = stack
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para o despacho de mensagens.
+'''
+
+from __future__ import annotations
+
+import asyncio
+
+from collections import deque
+from enum import Enum
+from time import monotonic
+
+import discord
+
+
+class MessagePriority(Enum):
+
+    '''
+    Enumerador para as prioridades de envio. Valores menores são enviados primeiro.
+    '''
+
+    HIGH = 0
+    NORMAL = 1
+
+
+class TokenBucket():
+
+    '''
+    Balde de fichas para o controle da taxa de envio.
+    '''
+
+    _rate: float
+    _capacity: float
+    _tokens: float
+    _updated: float
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+
+    def consume(self) -> float:
+        '''
+        Consome uma ficha, se houver. Retorna 0 em caso de sucesso ou o tempo até a próxima ficha.
+        '''
+
+        now = monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+
+        return (1.0 - self._tokens) / self._rate
+
+
+class _OutgoingMessage():
+
+    '''
+    Mensagem aguardando envio.
+    '''
+
+    __slots__ = ('destination', 'embed', 'future')
+
+    destination: discord.abc.Messageable
+    embed: discord.Embed
+    future: asyncio.Future
+
+    def __init__(self, destination: discord.abc.Messageable, embed: discord.Embed, future: asyncio.Future) -> None:
+        self.destination = destination
+        self.embed = embed
+        self.future = future
+
+
+class _ChannelQueue():
+
+    '''
+    Filas de um canal, uma por prioridade, com o seu balde de fichas.
+    '''
+
+    __slots__ = ('lanes', 'bucket', 'worker')
+
+    lanes: dict[MessagePriority, deque[_OutgoingMessage]]
+    bucket: TokenBucket
+    worker: asyncio.Task | None
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.lanes = {priority: deque() for priority in sorted(MessagePriority, key=lambda item: item.value)}
+        self.bucket = bucket
+        self.worker = None
+
+    def __bool__(self) -> bool:
+        return any(self.lanes.values())
+
+
+class MessageDispatcher():
+
+    '''
+    Despachante de mensagens.
+
+    Cada canal tem filas por prioridade e um balde de fichas que limita a taxa de envio, evitando
+    que rajadas de comandos se acumulem nos locks de rota do discord.py. Mensagens de maior
+    prioridade são enviadas primeiro. Com a coalescência ativa, embeds pendentes para o mesmo
+    canal são agrupados em uma única mensagem, respeitando os limites do Discord.
+    '''
+
+    MAX_EMBEDS = 10
+    MAX_EMBEDS_LENGTH = 6000
+
+    _channels: dict[int, _ChannelQueue]
+    _rate: float
+    _burst: int
+    _coalesce: bool
+
+    def __init__(self, rate: float = 1.0, burst: int = 5, coalesce: bool = True) -> None:
+        self._channels = {}
+        self._rate = rate
+        self._burst = burst
+        self._coalesce = coalesce
+
+    @property
+    def pending_count(self) -> int:
+        '''
+        Getter do número de mensagens aguardando envio.
+        '''
+
+        return sum(len(lane) for channel in self._channels.values() for lane in channel.lanes.values())
+
+    async def send(self,
+                   destination: discord.abc.Messageable,
+                   embed: discord.Embed,
+                   priority: MessagePriority = MessagePriority.NORMAL) -> None:
+        '''
+        Enfileira um embed e aguarda o seu envio.
+        '''
+
+        channel_id = getattr(getattr(destination, 'channel', destination), 'id', id(destination))
+        channel = self._channels.get(channel_id)
+
+        if channel is None:
+            channel = self._channels[channel_id] = _ChannelQueue(TokenBucket(self._rate, self._burst))
+
+        future = asyncio.get_running_loop().create_future()
+        channel.lanes[priority].append(_OutgoingMessage(destination, embed, future))
+
+        if channel.worker is None:
+            channel.worker = asyncio.ensure_future(self._drain(channel_id, channel))
+
+        await future
+
+    async def close(self) -> None:
+        '''
+        Aguarda o envio de todas as mensagens pendentes.
+        '''
+
+        workers = [channel.worker for channel in self._channels.values() if channel.worker is not None]
+
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _drain(self, channel_id: int, channel: _ChannelQueue) -> None:
+        '''
+        Envia as mensagens de um canal até esvaziar as suas filas.
+        '''
+
+        try:
+            while channel:
+                delay = channel.bucket.consume()
+
+                while delay > 0.0:
+                    await asyncio.sleep(delay)
+                    delay = channel.bucket.consume()
+
+                batch = self._take_batch(channel)
+
+                try:
+                    await batch[0].destination.send(embeds=[message.embed for message in batch])
+                except Exception as error:  # pylint: disable=broad-except
+                    for message in batch:
+                        if not message.future.done():
+                            message.future.set_exception(error)
+                else:
+                    for message in batch:
+                        if not message.future.done():
+                            message.future.set_result(None)
+        finally:
+            channel.worker = None
+
+            if not channel:
+                del self._channels[channel_id]
+
+    def _take_batch(self, channel: _ChannelQueue) -> list[_OutgoingMessage]:
+        '''
+        Retira a próxima mensagem e, com a coalescência ativa, as seguintes que couberem nela.
+        '''
+
+        batch: list[_OutgoingMessage] = []
+        length = 0
+
+        for lane in channel.lanes.values():
+            while lane:
+                size = len(lane[0].embed)
+
+                if batch and (not self._coalesce
+                              or len(batch) >= self.MAX_EMBEDS
+                              or length + size > self.MAX_EMBEDS_LENGTH):
+                    return batch
+
+                batch.append(lane.popleft())
+                length += size
+
+        return batch
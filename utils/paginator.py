@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para a paginação de textos longos.
+'''
+
+from typing import Iterable, Iterator
+
+
+class Paginator():
+
+    '''
+    Divide textos em páginas.
+    '''
+
+    @staticmethod
+    def paginate(lines: Iterable[str], limit: int) -> Iterator[str]:
+        '''
+        Agrupa as linhas em páginas de até limit caracteres, quebrando entre as linhas.
+
+        As páginas são geradas sob demanda, então as linhas podem vir de um iterador arbitrariamente
+        longo. Linhas maiores que o limite são quebradas no próprio limite.
+        '''
+
+        if limit < 1:
+            raise ValueError('The page limit must be positive')
+
+        page: list[str] = []
+        length = 0
+
+        for line in lines:
+            while len(line) > limit:
+                if page:
+                    yield '\n'.join(page)
+                    page = []
+                    length = 0
+
+                yield line[:limit]
+                line = line[limit:]
+
+            added = len(line) + (1 if page else 0)
+
+            if page and length + added > limit:
+                yield '\n'.join(page)
+                page = [line]
+                length = len(line)
+            else:
+                page.append(line)
+                length += added
+
+        if any(page):
+            yield '\n'.join(page)
@@ -4,8 +4,106 @@
 Módulo para o armazenamento de métodos.
 '''
 
+from __future__ import annotations
+from typing import Any, Iterable
+
+from copy import deepcopy
+
 import discord
 
+from discpybotframe.utils.dispatcher import MessagePriority
+from discpybotframe.utils.paginator import Paginator
+
+
+# Prefixo e cor pré-computados para mensagens normais (False) e de erro (True)
+_STYLES: dict[bool, tuple[str, discord.Color]] = {False: ('❱❱❱', discord.Color.dark_purple()),
+                                                  True: ('❌ ', discord.Color.red())}
+
+
+class _CachedEmbed(discord.Embed):
+
+    '''
+    Embed imutável que reaproveita o seu dicionário serializado em todos os envios.
+
+    Como o dicionário é fixo, alterações não seriam enviadas, então elas lançam TypeError. Para
+    alterar o embed, use copy, que retorna um discord.Embed comum.
+    '''
+
+    __slots__ = ('_cached_payload',)
+
+    _cached_payload: dict
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # O embed fica imutável depois que o dicionário é associado
+        if hasattr(self, '_cached_payload'):
+            self._immutable()
+
+        super().__setattr__(name, value)
+
+    def _immutable(self, *_args: Any, **_kwargs: Any) -> Any:
+        raise TypeError('Cached embeds are immutable, use copy() to change them')
+
+    set_footer = remove_footer = set_image = set_thumbnail = set_author = remove_author = _immutable  # type: ignore
+    add_field = insert_field_at = clear_fields = remove_field = set_field_at = _immutable  # type: ignore
+
+    def copy(self) -> discord.Embed:  # type: ignore
+        return discord.Embed.from_dict(deepcopy(self._cached_payload))
+
+    def to_dict(self) -> dict:  # type: ignore
+        return self._cached_payload
+
+
+class EmbedTemplate():
+
+    '''
+    Embed pré-computado para respostas estáticas.
+
+    O título, a cor e o dicionário serializado são calculados uma única vez. Sem campos dinâmicos,
+    todos os envios reutilizam o mesmo embed. Com campos dinâmicos, apenas eles são preenchidos
+    sobre uma cópia rasa do dicionário.
+    '''
+
+    _payload: dict
+    _embed: _CachedEmbed
+    _length: int
+
+    def __init__(self, title: str, description: str, footer: str, error: bool = False, url: str = '') -> None:
+        embed = DiscordUtilities.build_embed(title, description, footer, error, url)
+
+        self._payload = embed.to_dict()
+        self._length = len(embed)
+        self._embed = _CachedEmbed.from_dict(self._payload)  # type: ignore
+        self._embed._cached_payload = self._payload
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def embed(self) -> discord.Embed:
+        '''
+        Getter do embed estático. O embed é imutável; use copy para alterá-lo.
+        '''
+
+        return self._embed
+
+    def render(self, description: str | None = None, footer: str | None = None) -> discord.Embed:
+        '''
+        Retorna o embed, substituindo apenas os campos dinâmicos informados.
+        '''
+
+        if description is None and footer is None:
+            return self._embed
+
+        payload = dict(self._payload)
+
+        if description is not None:
+            payload['description'] = description
+
+        if footer is not None:
+            payload['footer'] = {'text': footer}
+
+        return discord.Embed.from_dict(payload)
+
 
 class DiscordUtilities():
 
@@ -13,24 +111,63 @@ class DiscordUtilities():
     Utilidades.
     '''
 
+    EMBED_LIMIT = 4096
+    # Espaço reservado no rodapé para o número da página
+    PAGE_SUFFIX_RESERVE = 12
+
     @staticmethod
     async def send_message(ctx,
                            title: str,
                            description: str,
                            footer: str,
                            error: bool = False,
-                           url: str = '') -> None:
+                           url: str = '',
+                           priority: MessagePriority = MessagePriority.NORMAL) -> None:
         '''
-        Envia uma mensagem.
+        Envia uma mensagem. Mensagens maiores que o limite são divididas em páginas.
         '''
 
-        embed: discord.Embed | None = None
-        prefix = '❱❱❱'
-        color = discord.Color.dark_purple()
+        prefix = _STYLES[error][0]
+
+        # O tamanho é verificado antes de construir o embed
+        if len(f'{prefix} **{title}**') + len(description) + len(footer) <= DiscordUtilities.EMBED_LIMIT:
+            embed = DiscordUtilities.build_embed(title, description, footer, error, url)
+            await DiscordUtilities.send_embed(ctx, embed, MessagePriority.HIGH if error else priority)
+        else:
+            await DiscordUtilities.send_paginated(ctx, title, description.split('\n'), footer, error, url, priority)
+
+    @staticmethod
+    async def send_paginated(ctx,
+                             title: str,
+                             lines: Iterable[str],
+                             footer: str,
+                             error: bool = False,
+                             url: str = '',
+                             priority: MessagePriority = MessagePriority.NORMAL) -> None:
+        '''
+        Envia as linhas em uma ou mais mensagens, quebrando entre as linhas.
+
+        As páginas são construídas e enviadas uma a uma, à medida que as linhas são consumidas.
+        '''
 
-        if error:
-            prefix = '❌ '
-            color = discord.Color.red()
+        prefix = _STYLES[error][0]
+        limit = (DiscordUtilities.EMBED_LIMIT
+                 - len(f'{prefix} **{title}**')
+                 - len(footer)
+                 - DiscordUtilities.PAGE_SUFFIX_RESERVE)
+
+        for index, page in enumerate(Paginator.paginate(lines, max(limit, 1)), start=1):
+            embed = DiscordUtilities.build_embed(title, page, f'{footer} ({index})', error, url)
+            await DiscordUtilities.send_embed(ctx, embed, MessagePriority.HIGH if error else priority)
+
+    @staticmethod
+    def build_embed(title: str, description: str, footer: str, error: bool = False, url: str = '') -> discord.Embed:
+        '''
+        Constrói o embed de uma mensagem.
+        '''
+
+        embed: discord.Embed | None = None
+        prefix, color = _STYLES[error]
 
         if url is not None:
 
@@ -48,10 +185,7 @@ class DiscordUtilities():
 
         embed.set_footer(text=f'{footer}')
 
-        if len(embed) <= 4096:
-            await ctx.send(embed=embed)
-        else:
-            await DiscordUtilities.send_error_message(ctx, 'A mensagem gerada pelo comando é muito grande', '')
+        return embed
 
     @staticmethod
     async def send_error_message(ctx, description: str, footer: str) -> None:
@@ -59,12 +193,52 @@ class DiscordUtilities():
         Envia um erro.
         '''
 
-        prefix = '❌ '
-        color = discord.Color.red()
+        prefix, color = _STYLES[True]
         embed = discord.Embed(title=f'{prefix} **Erro**',
                               type='rich',
                               description=description,
                               color=color)
 
         embed.set_footer(text=f'{footer}')
-        await ctx.send(embed=embed)
+        await DiscordUtilities.send_embed(ctx, embed, MessagePriority.HIGH)
+
+    @staticmethod
+    async def send_template(ctx,
+                            template: EmbedTemplate,
+                            description: str | None = None,
+                            footer: str | None = None,
+                            priority: MessagePriority = MessagePriority.NORMAL) -> None:
+        '''
+        Envia um embed pré-computado, preenchendo apenas os campos dinâmicos informados.
+        '''
+
+        await DiscordUtilities.send_embed(ctx, template.render(description, footer), priority)
+
+    @staticmethod
+    async def send_embed(ctx, embed: discord.Embed, priority: MessagePriority = MessagePriority.NORMAL) -> None:
+        '''
+        Envia um embed pelo despachante do bot, se houver, registrando a duração do envio nas
+        métricas do bot, se houver.
+        '''
+
+        metrics = getattr(ctx.bot, 'metrics', None)
+
+        if metrics is None:
+            await DiscordUtilities._dispatch(ctx, embed, priority)
+            return
+
+        with metrics.timer('send', ctx.command.qualified_name if ctx.command is not None else 'none'):
+            await DiscordUtilities._dispatch(ctx, embed, priority)
+
+    @staticmethod
+    async def _dispatch(ctx, embed: discord.Embed, priority: MessagePriority) -> None:
+        '''
+        Envia um embed pelo despachante do bot ou diretamente pelo contexto.
+        '''
+
+        dispatcher = getattr(ctx.bot, 'dispatcher', None)
+
+        if dispatcher is None:
+            await ctx.send(embed=embed)
+        else:
+            await dispatcher.send(ctx, embed, priority)
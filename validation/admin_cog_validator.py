@@ -7,9 +7,11 @@ Validador da cog de admin.
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+from functools import lru_cache
+
 from discord.ext import commands
 
-from discpybotframe.validation.validation_checks import ValidationChecks
+from discpybotframe.validation.command_validator import CommandValidator, RequireAdmin
 
 if TYPE_CHECKING:
     from discpybotframe.discord.bot import Bot
@@ -27,4 +29,13 @@ class AdminCogValidator():
         Valida o comando de desligar o bot.
         '''
 
-        return await ValidationChecks.require_adm(ctx, bot, error, footer)
+        return await AdminCogValidator._shutdown_validator(error).validate(ctx, bot, (), footer) is not None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _shutdown_validator(error: str) -> CommandValidator:
+        '''
+        Retorna o validador compilado do comando de desligar o bot.
+        '''
+
+        return CommandValidator(RequireAdmin(error))
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+'''
+Módulo para a validação declarativa de comandos.
+'''
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, Tuple
+
+from discord.ext import commands
+
+from discpybotframe.internals.permissions import Permission
+from discpybotframe.utils.utilities import DiscordUtilities
+from discpybotframe.validation.validation_checks import ArgumentType
+
+if TYPE_CHECKING:
+    from discpybotframe.discord.bot import Bot
+
+
+# Os aliases são avaliados na importação; Optional e Tuple mantêm a compatibilidade com o Python 3.8
+_Check = Callable[[commands.Context, 'Bot', tuple], Optional[str]]
+_AsyncCheck = Callable[[commands.Context, 'Bot'], Awaitable[Optional[str]]]
+_Converter = Callable[[str], Tuple[Any, Optional[str]]]
+
+_CONVERSIONS: dict[ArgumentType, Callable[[str], Any]] = {ArgumentType.INTEGER: int,
+                                                          ArgumentType.FLOAT: float}
+
+
+class RequireAdmin():
+
+    '''
+    Requisito de administrador global do bot.
+    '''
+
+    __slots__ = ('error',)
+
+    error: str
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+class RequireGuild():
+
+    '''
+    Requisito de execução em um servidor.
+    '''
+
+    __slots__ = ('error',)
+
+    error: str
+
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+class RequirePermission():
+
+    '''
+    Requisito de permissões no servidor do comando.
+    '''
+
+    __slots__ = ('permission', 'error')
+
+    permission: Permission
+    error: str
+
+    def __init__(self, permission: Permission, error: str) -> None:
+        self.permission = permission
+        self.error = error
+
+
+class RequireArgCount():
+
+    '''
+    Requisito do número de argumentos.
+    '''
+
+    __slots__ = ('range_', 'error')
+
+    range_: tuple[int, int]
+    error: str
+
+    def __init__(self, range_: tuple[int, int], error: str) -> None:
+        self.range_ = range_
+        self.error = error
+
+
+class Argument():
+
+    '''
+    Declaração de um argumento posicional. Sem tipo, o argumento é uma string e length_range
+    limita o seu tamanho. Com tipo, o argumento é convertido e range_ limita o seu valor.
+    '''
+
+    __slots__ = ('type_', 'range_', 'length_range', 'error')
+
+    type_: ArgumentType | None
+    range_: tuple[float, float] | None
+    length_range: tuple[int, int] | None
+    error: str
+
+    def __init__(self,
+                 error: str,
+                 type_: ArgumentType | None = None,
+                 range_: tuple[float, float] | None = None,
+                 length_range: tuple[int, int] | None = None) -> None:
+        self.type_ = type_
+        self.range_ = range_
+        self.length_range = length_range
+        self.error = error
+
+
+class CommandValidator():
+
+    '''
+    Validador compilado de um comando.
+
+    Os requisitos são declarados uma vez e compilados em funções especializadas. Cada validação
+    converte os argumentos em uma única passagem, reúne todos os erros e envia uma única mensagem.
+    '''
+
+    _checks: tuple[_Check, ...]
+    _async_checks: tuple[_AsyncCheck, ...]
+    _converters: tuple[_Converter, ...]
+
+    def __init__(self, *requirements: RequireAdmin | RequireGuild | RequirePermission | RequireArgCount | Argument) -> None:
+        checks: list[_Check] = []
+        async_checks: list[_AsyncCheck] = []
+        converters: list[_Converter] = []
+
+        for requirement in requirements:
+            if isinstance(requirement, Argument):
+                converters.append(_compile_argument(requirement))
+            elif isinstance(requirement, RequirePermission):
+                async_checks.append(_compile_permission(requirement))
+            else:
+                checks.append(_compile_check(requirement))
+
+        self._checks = tuple(checks)
+        self._async_checks = tuple(async_checks)
+        self._converters = tuple(converters)
+
+    async def validate(self, ctx: commands.Context, bot: Bot, args: tuple = (), footer: str = '') -> tuple | None:
+        '''
+        Valida o comando e retorna os argumentos convertidos. Se houver erros, envia uma única
+        mensagem com todos eles e retorna None.
+        '''
+
+        errors = [error for error in (check(ctx, bot, args) for check in self._checks) if error is not None]
+
+        for async_check in self._async_checks:
+            error = await async_check(ctx, bot)
+
+            if error is not None:
+                errors.append(error)
+
+        values = list(args)
+
+        for index, (converter, arg) in enumerate(zip(self._converters, args)):
+            values[index], error = converter(arg)
+
+            if error is not None:
+                errors.append(error)
+
+        if errors:
+            # Mensagens repetidas aparecem uma única vez
+            await DiscordUtilities.send_error_message(ctx, '\n'.join(dict.fromkeys(errors)), footer)
+            return None
+
+        return tuple(values)
+
+
+def _compile_check(requirement: RequireAdmin | RequireGuild | RequireArgCount) -> _Check:
+    '''
+    Compila um requisito do contexto.
+    '''
+
+    error = requirement.error
+
+    if isinstance(requirement, RequireAdmin):
+        return lambda ctx, bot, args: None if bot.permissions.is_global_admin(ctx.author.id) else error
+
+    if isinstance(requirement, RequireGuild):
+        return lambda ctx, bot, args: None if ctx.guild is not None else error
+
+    minimum, maximum = requirement.range_
+
+    return lambda ctx, bot, args: None if minimum <= len(args) <= maximum else error
+
+
+def _compile_permission(requirement: RequirePermission) -> _AsyncCheck:
+    '''
+    Compila um requisito de permissões.
+    '''
+
+    permission = requirement.permission
+    error = requirement.error
+
+    async def check(ctx: commands.Context, bot: Bot) -> str | None:
+        guild_id = ctx.guild.id if ctx.guild is not None else None
+        return None if await bot.permissions.has(ctx.author, permission, guild_id) else error
+
+    return check
+
+
+def _compile_argument(argument: Argument) -> _Converter:
+    '''
+    Compila a conversão e as verificações de um argumento.
+    '''
+
+    error = argument.error
+
+    if argument.type_ is None:
+        min_length, max_length = argument.length_range if argument.length_range is not None else (0, float('inf'))
+
+        def convert_str(arg: str) -> tuple[Any, str | None]:
+            return arg, None if min_length <= len(arg) <= max_length else error
+
+        return convert_str
+
+    conversion = _CONVERSIONS[argument.type_]
+    minimum, maximum = argument.range_ if argument.range_ is not None else (float('-inf'), float('inf'))
+
+    def convert(arg: str) -> tuple[Any, str | None]:
+        try:
+            value = conversion(arg)
+        except ValueError:
+            return arg, error
+
+        if not minimum <= value <= maximum:
+            return arg, error
+
+        return value, None
+
+    return convert
@@ -11,6 +11,7 @@ from enum import Enum
 
 from discord.ext import commands
 
+from discpybotframe.internals.permissions import Permission
 from discpybotframe.utils.utilities import DiscordUtilities
 
 if TYPE_CHECKING:
@@ -39,7 +40,18 @@ class ValidationChecks():
         Verifica se o usuário é o administrador do bot.
         '''
 
-        if not bot.is_admin(ctx.author.id):
+        if not bot.permissions.is_global_admin(ctx.author.id):
+            await DiscordUtilities.send_error_message(ctx, error, footer)
+            return False
+        return True
+
+    @staticmethod
+    async def require_permission(ctx: commands.Context, bot: Bot, permission: Permission, error: str, footer: str) -> bool:
+        '''
+        Verifica se o usuário tem as permissões no servidor do comando.
+        '''
+
+        if not await bot.permissions.has(ctx.author, permission, ctx.guild.id if ctx.guild is not None else None):
             await DiscordUtilities.send_error_message(ctx, error, footer)
             return False
         return True